@@ -1,456 +1,453 @@
 import streamlit as st
 import pandas as pd
-import pickle
+import altair as alt
+import os
+import time
+import cProfile
+import functools
+import io
+import pstats
+
+from form_options import (
+    app_mode_dict, course_dict, marital_dict, nacionality_dict, parent_occupation_dict,
+    parent_qualification_dict, previous_qualification_dict,
+)
+import scoring
+from prediction_cache import PredictionCache, cached_predict, model_signature
+from metrics import MetricsRegistry, start_http_server
+from jobs import DONE, FAILED, QUEUED, RUNNING, JobManager
+from model_registry import ModelRegistry
+from what_if import WHAT_IF_FIELDS, sweep
+from drift import DRIFT_LEVELS, FeatureHistogram
 
 st.set_page_config(page_title="Prediksi Dropout Mahasiswa", layout="wide")
 
+rerun_start = time.perf_counter()
+
+# APP_DEBUG=1 memprofil setiap rerun, penuh maupun fragment, dan
+# menampilkan fungsi termahal
+DEBUG_PROFILE = os.environ.get("APP_DEBUG") == "1"
+profiling = False
+
+def start_profile():
+    global profiling
+    # Fragment yang berjalan di dalam rerun penuh atau fragment lain sudah
+    # tercakup profil terluar
+    if not DEBUG_PROFILE or profiling:
+        return None
+    profile = cProfile.Profile()
+    try:
+        profile.enable()
+    except ValueError:
+        # Profiler lain (mis. sesi lain) sedang aktif di proses yang sama
+        return None
+    profiling = True
+    return profile
+
+def stop_profile(profile):
+    global profiling
+    if profile is None:
+        return None
+    profile.disable()
+    profiling = False
+    stream = io.StringIO()
+    pstats.Stats(profile, stream=stream).sort_stats("cumulative").print_stats(25)
+    return stream.getvalue()
+
+profiler = start_profile()
+
+# Instrumentasi aktif jika METRICS_ENABLED=1 atau METRICS_PORT diisi;
+# METRICS_PORT juga membuka endpoint /metrics berformat Prometheus
 @st.cache_resource
-def load_model():
-    with open("rf_model.pkl", "rb") as f:
-        model, feature_names = pickle.load(f)
-    return model, feature_names
+def get_metrics():
+    port = os.environ.get("METRICS_PORT")
+    registry = MetricsRegistry(enabled=bool(port) or os.environ.get("METRICS_ENABLED") == "1")
+    if port:
+        start_http_server(registry, int(port))
+    return registry
+
+metrics = get_metrics()
+
+# Rerun fragment tidak menjalankan ulang kode level modul, jadi waktu dan
+# profil interaksi di dalam fragment (Prediksi, what-if) dicatat di sini
+def timed_fragment(stage):
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            profile = start_profile()
+            try:
+                with metrics.timer(stage):
+                    result = func(*args, **kwargs)
+            finally:
+                report = stop_profile(profile)
+            if report is not None:
+                with st.expander(f"Profil {stage} (debug)"):
+                    st.caption(f"Rerun fragment: {(time.perf_counter() - start) * 1000:.0f} ms")
+                    st.code(report)
+            return result
+        return wrapper
+    return decorate
 
-model, feature_names = load_model()
+MODEL_PATH = os.environ.get("MODEL_PATH", scoring.MODEL_PATH)
+MODEL_DIR = os.environ.get("MODEL_DIR")
+MODEL_ENGINE = os.environ.get("MODEL_ENGINE", "sklearn")
+
+# Dengan MODEL_DIR, versi model baru dimuat dan dipanaskan di latar belakang
+# oleh ModelRegistry lalu ditukar tanpa restart; MODEL_SHADOW=1 menjadikan
+# versi baru kandidat yang dibandingkan dulu dengan model aktif
+@st.cache_resource
+def get_model_registry():
+    return ModelRegistry(MODEL_DIR, engine=MODEL_ENGINE, shadow=os.environ.get("MODEL_SHADOW") == "1")
+
+# Tanpa MODEL_DIR, signature ikut menjadi kunci cache sehingga model dan
+# cache prediksi dimuat ulang otomatis ketika file model berubah
+@st.cache_resource(max_entries=1)
+def load_model(signature):
+    return scoring.load_model(MODEL_PATH, engine=MODEL_ENGINE)
+
+@st.cache_resource(max_entries=1)
+def get_prediction_cache(model_key):
+    return PredictionCache()
+
+model_registry = get_model_registry() if MODEL_DIR else None
+
+# Dipanggil di dalam fragment, bukan sekali di level modul: rerun fragment
+# tidak menjalankan ulang kode modul, sehingga model yang ditukar registry
+# atau file model yang berubah baru terlihat jika diambil di sini
+def current_model():
+    if model_registry is not None:
+        active_model = model_registry.active
+        model_key = (active_model.version, active_model.signature)
+        return active_model.model, active_model.feature_names, get_prediction_cache(model_key)
+    model_key = model_signature(MODEL_PATH)
+    model, feature_names = load_model(model_key)
+    return model, feature_names, get_prediction_cache(model_key)
+
+BATCH_CHUNK_SIZE = 5000
 
 def build_selectbox(label, options_dict):
     return st.selectbox(label, options=list(options_dict.keys()), format_func=lambda x: options_dict[x])
 
-def preprocess_input_raw(raw):
-
-    # Mapping kategori
-    edu_map = {'Basic': 0, 'Secondary': 1, 'Higher': 2, 'Other': 3}
-    grade_map = {'Very Low': 0, 'Low': 1, 'High': 2, 'Very High': 3}
-    age_map = {'<18': 0, '18-21': 1, '22-25': 2, '>25': 3}
-    binary_map = {'Local': 0, 'Foreign': 1, 'Officer': 0, 'Labor': 1, 'Other': 2}
-    course_map = {
-        'Engineering/Tech': 0, 'Arts/Design': 1, 'Health': 2,
-        'Social Sciences': 3, 'Business': 4, 'Other': 5
-    }
-    app_mode_map = {
-        'Regular': 0, 'Special': 1, 'International': 2,
-        'Transfer': 3, 'Other': 4, 'Unknown': 5
-    }
-
-    def simplify_application_mode(mode):
-        if mode in [1, 17, 18]:
-            return 'Regular'
-        elif mode in [2, 5, 10, 16]:
-            return 'Special'
-        elif mode in [15, 57]:
-            return 'International'
-        elif mode in [42, 43, 51, 53]:
-            return 'Transfer'
-        elif mode in [26, 27, 39, 44]:
-            return 'Other'
-        return 'Unknown'
-
-    def simplify_edu(code):
-        if code in [19, 37, 38, 35, 36]:
-            return 'Basic'
-        elif code in [1, 9, 10, 12, 14, 15, 22, 26, 27, 29, 30]:
-            return 'Secondary'
-        elif code in [2, 3, 4, 5, 6, 40, 41, 42, 43, 44]:
-            return 'Higher'
-        return 'Other'
-
-    def simplify_nacionality(code):
-        return 'Local' if code == 1 else 'Foreign'
-
-    def simplify_admission_grade(g):
-        if g <= 117.9:
-            return 'Very Low'
-        elif g <= 126.1:
-            return 'Low'
-        elif g <= 134.8:
-            return 'High'
-        else:
-            return 'Very High'
-        
-    def simplify_sem1_grade(val):
-        if val <= 11.0:
-            return 'Very Low'
-        elif val <= 12.29:
-            return 'Low'
-        elif val <= 13.4:
-            return 'High'
-        else:
-            return 'Very High'
-
-    def simplify_sem2_grade(val):
-        if val <= 10.75:
-            return 'Very Low'
-        elif val <= 12.2:
-            return 'Low'
-        elif val <= 13.33:
-            return 'High'
-        else:
-            return 'Very High'
-
-    def simplify_prev_qual_grade(val):
-        if val <= 125:
-            return 'Very Low'
-        elif val <= 133.1:
-            return 'Low'
-        elif val <= 140:
-            return 'High'
-        else:
-            return 'Very High'
-
-    def simplify_age(age):
-        if age < 18:
-            return '<18'
-        elif age <= 21:
-            return '18-21'
-        elif age <= 25:
-            return '22-25'
-        else:
-            return '>25'
-
-    def occupation_group(code):
-        officer = {1, 2, 3, 4, 112, 114, 121, 122, 123, 124, 131, 132, 134, 135, 141, 143, 144}
-        labor = {5, 6, 7, 8, 9, 10, 151, 152, 153, 154, 161, 163, 171, 172, 174, 175, 181, 182, 183, 191, 192, 193, 194, 195}
-        if code in officer:
-            return 'Officer'
-        elif code in labor:
-            return 'Labor'
-        return 'Other'
-
-    def simplify_course(code):
-        if code in [33, 9119, 9130]:
-            return 'Engineering/Tech'
-        elif code in [171, 9070, 9773]:
-            return 'Arts/Design'
-        elif code in [9500, 9556, 9085]:
-            return 'Health'
-        elif code in [8014, 9238, 9853]:
-            return 'Social Sciences'
-        elif code in [9147, 9991, 9254]:
-            return 'Business'
-        return 'Other'
-
-    def encode(val, mapping):
-        return mapping.get(val, 0)
-
-    return {
-        'Previous_qualification': encode(simplify_edu(raw['Previous_qualification']), edu_map),
-        'Mothers_qualification': encode(simplify_edu(raw['Mothers_qualification']), edu_map),
-        'Fathers_qualification': encode(simplify_edu(raw['Fathers_qualification']), edu_map),
-        'Admission_grade': encode(simplify_admission_grade(raw['Admission_grade']), grade_map),
-        'Curricular_units_1st_sem_grade': encode(simplify_sem1_grade(raw['Curricular_units_1st_sem_grade']), grade_map),
-        'Curricular_units_2nd_sem_grade': encode(simplify_sem2_grade(raw['Curricular_units_2nd_sem_grade']), grade_map),
-        'Previous_qualification_grade': encode(simplify_prev_qual_grade(raw['Previous_qualification_grade']), grade_map),
-        'Age_at_enrollment': encode(simplify_age(raw['Age_at_enrollment']), age_map),
-        'Nacionality': encode(simplify_nacionality(raw['Nacionality']), binary_map),
-        'Fathers_occupation': encode(occupation_group(raw['Fathers_occupation']), binary_map),
-        'Mothers_occupation': encode(occupation_group(raw['Mothers_occupation']), binary_map),
-        'Course': encode(simplify_course(raw['Course']), course_map),
-        'Application_mode': encode(simplify_application_mode(raw['Application_mode']), app_mode_map)
-    }
-
 st.title("🎓 Prediksi Dropout Mahasiswa")
 st.write("Silakan masukkan data dengan sesuai.")
 
-with st.form("form_input"):
-    col1, col2, col3 = st.columns(3)
+tab_form, tab_file = st.tabs(["Input Manual", "Unggah File"])
 
-    with col1:
-        marital_dict = {
-            1: "#1 Single", 2: "#2 Married", 3: "#3 Widower", 4: "#4 Divorced",
-            5: "#5 Facto Union", 6: "#6 Legally Separated"
-        }
-        Marital_status = build_selectbox("Status Pernikahan", marital_dict)
+# Form dan hasilnya berjalan sebagai fragment: menekan Prediksi hanya
+# merender ulang bagian ini, bukan sidebar dan tab unggah file
+@st.fragment
+@timed_fragment("rerun_form")
+def input_form():
+    with st.form("form_input"):
+        col1, col2, col3 = st.columns(3)
 
-        app_mode_dict = {
-            1: "#1 1st Phase - General", 2: "#2 Ordinance 612/93", 5: "#5 Special - Azores", 7: "#7 Holders of other higher courses", 10: "#10 Ordinance 854-B/99",
-            15: "#15 International Student", 16: "#16 1st phase - special contingent", 17: "#17 2nd Phase", 18: "#18 3rd Phase", 26: "#26 Ordinance No. 533-A/99, item b2",
-            27: "#27 Ordinance No. 533-A/99, item b3", 39: "#39 Over 23 years old", 42: "#42 Transfer", 43: "#43 Change of course", 44: "#44 Technological specialization diploma holders",
-            51: "#51 Change of institution/course", 53: "#53 Short cycle diploma holders", 57: "#57 Change of institution/course (International)"
-        }
-        Application_mode = build_selectbox("Application Mode", app_mode_dict)
-
-        Application_order = st.number_input("Urutan Aplikasi", 0, 9, 1)
-        course_dict = {
-            33: "#33 Biofuel Production Technologies",
-            171: "#171 Animation and Multimedia Design",
-            8014: "#8014 Social Service (evening attendance)",
-            9003: "#9003 Agronomy",
-            9070: "#9070 Communication Design",
-            9085: "#9085 Veterinary Nursing",
-            9119: "#9119 Informatics Engineering",
-            9130: "#9130 Equinculture",
-            9147: "#9147 Management",
-            9238: "#9238 Social Service",
-            9254: "#9254 Tourism",
-            9500: "#9500 Nursing",
-            9556: "#9556 Oral Hygiene",
-            9670: "#9670 Advertising and Marketing Management",
-            9773: "#9773 Journalism and Communication",
-            9853: "#9853 Basic Education",
-            9991: "#9991 Management (evening attendance)"
-        }
-        Course = build_selectbox("Program Studi", course_dict)
-        previous_qualification_dict = {
-            1: "#1 Secondary education",
-            2: "#2 Higher education - bachelor's degree",
-            3: "#3 Higher education - degree",
-            4: "#4 Higher education - master's",
-            5: "#5 Higher education - doctorate",
-            6: "#6 Frequency of higher education",
-            9: "#9 12th year of schooling - not completed",
-            10: "#10 11th year of schooling - not completed",
-            12: "#12 Other 11th year of schooling",
-            14: "#14 10th year of schooling",
-            15: "#15 10th year of schooling - not completed",
-            19: "#19 Basic education 3rd cycle (9th/10th/11th year) or equiv.",
-            38: "#38 Basic education 2nd cycle (6th/7th/8th year) or equiv.",
-            39: "#39 Technological specialization course",
-            40: "#40 Higher education - degree (1st cycle)",
-            42: "#42 Professional higher technical course",
-            43: "#43 Higher education - master (2nd cycle)"
-        }
-        Previous_qualification = build_selectbox("Kualifikasi Sebelumnya", previous_qualification_dict)
-        Previous_qualification_grade = st.number_input("Nilai Kualifikasi Sebelumnya", 95.0, 190.0, 120.0)
-        nacionality_dict = {
-            1: "#1 Portuguese",
-            2: "#2 German",
-            6: "#6 Spanish",
-            11: "#11 Italian",
-            13: "#13 Dutch",
-            14: "#14 English",
-            17: "#17 Lithuanian",
-            21: "#21 Angolan",
-            22: "#22 Cape Verdean",
-            24: "#24 Guinean",
-            25: "#25 Mozambican",
-            26: "#26 Santomean",
-            32: "#32 Turkish",
-            41: "#41 Brazilian",
-            62: "#62 Romanian",
-            100: "#100 Moldova (Republic of)",
-            101: "#101 Mexican",
-            103: "#103 Ukrainian",
-            105: "#105 Russian",
-            108: "#108 Cuban",
-            109: "#109 Colombian"
-        }
-        Nacionality = build_selectbox("Kebangsaan", nacionality_dict)
-        parent_qualification_dict = {
-            1: "#1 Secondary Education - 12th Year of Schooling or Eq.",
-            2: "#2 Higher Education - Bachelor's Degree",
-            3: "#3 Higher Education - Degree",
-            4: "#4 Higher Education - Master's",
-            5: "#5 Higher Education - Doctorate",
-            6: "#6 Frequency of Higher Education",
-            9: "#9 12th Year of Schooling - Not Completed",
-            10: "#10 11th Year of Schooling - Not Completed",
-            11: "#11 7th Year (Old)",
-            12: "#12 Other - 11th Year of Schooling",
-            14: "#14 10th Year of Schooling",
-            18: "#18 General commerce course",
-            19: "#19 Basic Education 3rd Cycle (9th/10th/11th Year) or Equiv.",
-            22: "#22 Technical-professional course",
-            26: "#26 7th year of schooling",
-            27: "#27 2nd cycle of the general high school course",
-            29: "#29 9th Year of Schooling - Not Completed",
-            30: "#30 8th year of schooling",
-            34: "#34 Unknown",
-            35: "#35 Can't read or write",
-            36: "#36 Can read without having a 4th year of schooling",
-            37: "#37 Basic education 1st cycle (4th/5th year) or equiv.",
-            38: "#38 Basic Education 2nd Cycle (6th/7th/8th Year) or Equiv.",
-            39: "#39 Technological specialization course",
-            40: "#40 Higher education - degree (1st cycle)",
-            41: "#41 Specialized higher studies course",
-            42: "#42 Professional higher technical course",
-            43: "#43 Higher Education - Master (2nd cycle)",
-            44: "#44 Higher Education - Doctorate (3rd cycle)"
-        }
-        Mothers_qualification = build_selectbox("Kualifikasi Ibu", parent_qualification_dict)
-        Fathers_qualification = build_selectbox("Kualifikasi Ayah", parent_qualification_dict)
-        parent_occupation_dict = {
-            0: "#0 Student",
-            1: "#1 Representatives of the Legislative Power and Executive Bodies, Directors, Directors and Executive Managers",
-            2: "#2 Specialists in Intellectual and Scientific Activities",
-            3: "#3 Intermediate Level Technicians and Professions",
-            4: "#4 Administrative staff",
-            5: "#5 Personal Services, Security and Safety Workers and Sellers",
-            6: "#6 Farmers and Skilled Workers in Agriculture, Fisheries and Forestry",
-            7: "#7 Skilled Workers in Industry, Construction and Craftsmen",
-            8: "#8 Installation and Machine Operators and Assembly Workers",
-            9: "#9 Unskilled Workers",
-            10: "#10 Armed Forces Professions",
-            90: "#90 Other Situation",
-            99: "#99 (blank)",
-            122: "#122 Health professionals",
-            123: "#123 Teachers",
-            125: "#125 Specialists in information and communication technologies (ICT)",
-            131: "#131 Intermediate level science and engineering technicians and professions",
-            132: "#132 Technicians and professionals, of intermediate level of health",
-            134: "#134 Intermediate level technicians from legal, social, sports, cultural and similar services",
-            141: "#140 Office workers, secretaries in general and data processing operators",
-            143: "#143 Data, accounting, statistical, financial services and registry-related operators",
-            144: "#144 Other administrative support staff",
-            151: "#151 Personal service workers",
-            152: "#152 Sellers",
-            153: "#153 Personal care workers and the like",
-            171: "#171 Skilled construction workers and the like, except electricians",
-            173: "#173 Skilled workers in printing, precision instrument manufacturing, jewelers, artisans and the like",
-            175: "#175 Workers in food processing, woodworking, clothing and other industries and crafts",
-            191: "#191 Cleaning workers",
-            192: "#192 Unskilled workers in agriculture, animal production, fisheries and forestry",
-            193: "#193 Unskilled workers in extractive industry, construction, manufacturing and transport",
-            194: "#194 Meal preparation assistants"
-        }
-        Mothers_occupation = build_selectbox("Pekerjaan Ibu", parent_occupation_dict)
-        Fathers_occupation = build_selectbox("Pekerjaan Ayah", parent_occupation_dict)
-        Age_at_enrollment = st.number_input("Usia Saat Masuk", 15, 60, 15)
-
-    with col2:
-        # Semester 1
-        Curricular_units_1st_sem_credited = st.number_input(
-            "Curricular_units_1st_sem_credited", min_value=0, max_value=20, step=1
-        )
-        Curricular_units_1st_sem_enrolled = st.number_input(
-            "Curricular_units_1st_sem_enrolled", min_value=0, max_value=26, step=1
-        )
-        Curricular_units_1st_sem_evaluations = st.number_input(
-            "Curricular_units_1st_sem_evaluations", min_value=0, max_value=45, step=1
-        )
-        Curricular_units_1st_sem_approved = st.number_input(
-            "Curricular_units_1st_sem_approved", min_value=0, max_value=26, step=1
-        )
-        Curricular_units_1st_sem_grade = st.number_input(
-            "Curricular_units_1st_sem_grade", min_value=0.0, max_value=20.0, step=0.1
-        )
-        Curricular_units_1st_sem_without_evaluations = st.number_input(
-            "Curricular_units_1st_sem_without_evaluations", min_value=0, max_value=12, step=1
-        )
+        with col1:
+            Marital_status = build_selectbox("Status Pernikahan", marital_dict)
 
-        # Semester 2
-        Curricular_units_2nd_sem_credited = st.number_input(
-            "Curricular_units_2nd_sem_credited", min_value=0, max_value=19, step=1
-        )
-        Curricular_units_2nd_sem_enrolled = st.number_input(
-            "Curricular_units_2nd_sem_enrolled", min_value=0, max_value=23, step=1
-        )
-        Curricular_units_2nd_sem_evaluations = st.number_input(
-            "Curricular_units_2nd_sem_evaluations", min_value=0, max_value=33, step=1
-        )
-        Curricular_units_2nd_sem_approved = st.number_input(
-            "Curricular_units_2nd_sem_approved", min_value=0, max_value=20, step=1
-        )
-        Curricular_units_2nd_sem_grade = st.number_input(
-            "Curricular_units_2nd_sem_grade", min_value=0.0, max_value=20.0, step=0.1
-        )
-        Curricular_units_2nd_sem_without_evaluations = st.number_input(
-            "Curricular_units_2nd_sem_without_evaluations", min_value=0, max_value=12, step=1
-        )
+            Application_mode = build_selectbox("Application Mode", app_mode_dict)
+
+            Application_order = st.number_input("Urutan Aplikasi", 0, 9, 1)
+            Course = build_selectbox("Program Studi", course_dict)
+            Previous_qualification = build_selectbox("Kualifikasi Sebelumnya", previous_qualification_dict)
+            Previous_qualification_grade = st.number_input("Nilai Kualifikasi Sebelumnya", 95.0, 190.0, 120.0)
+            Nacionality = build_selectbox("Kebangsaan", nacionality_dict)
+            Mothers_qualification = build_selectbox("Kualifikasi Ibu", parent_qualification_dict)
+            Fathers_qualification = build_selectbox("Kualifikasi Ayah", parent_qualification_dict)
+            Mothers_occupation = build_selectbox("Pekerjaan Ibu", parent_occupation_dict)
+            Fathers_occupation = build_selectbox("Pekerjaan Ayah", parent_occupation_dict)
+            Age_at_enrollment = st.number_input("Usia Saat Masuk", 15, 60, 15)
+
+        with col2:
+            # Semester 1
+            Curricular_units_1st_sem_credited = st.number_input(
+                "Curricular_units_1st_sem_credited", min_value=0, max_value=20, step=1
+            )
+            Curricular_units_1st_sem_enrolled = st.number_input(
+                "Curricular_units_1st_sem_enrolled", min_value=0, max_value=26, step=1
+            )
+            Curricular_units_1st_sem_evaluations = st.number_input(
+                "Curricular_units_1st_sem_evaluations", min_value=0, max_value=45, step=1
+            )
+            Curricular_units_1st_sem_approved = st.number_input(
+                "Curricular_units_1st_sem_approved", min_value=0, max_value=26, step=1
+            )
+            Curricular_units_1st_sem_grade = st.number_input(
+                "Curricular_units_1st_sem_grade", min_value=0.0, max_value=20.0, step=0.1
+            )
+            Curricular_units_1st_sem_without_evaluations = st.number_input(
+                "Curricular_units_1st_sem_without_evaluations", min_value=0, max_value=12, step=1
+            )
+
+            # Semester 2
+            Curricular_units_2nd_sem_credited = st.number_input(
+                "Curricular_units_2nd_sem_credited", min_value=0, max_value=19, step=1
+            )
+            Curricular_units_2nd_sem_enrolled = st.number_input(
+                "Curricular_units_2nd_sem_enrolled", min_value=0, max_value=23, step=1
+            )
+            Curricular_units_2nd_sem_evaluations = st.number_input(
+                "Curricular_units_2nd_sem_evaluations", min_value=0, max_value=33, step=1
+            )
+            Curricular_units_2nd_sem_approved = st.number_input(
+                "Curricular_units_2nd_sem_approved", min_value=0, max_value=20, step=1
+            )
+            Curricular_units_2nd_sem_grade = st.number_input(
+                "Curricular_units_2nd_sem_grade", min_value=0.0, max_value=20.0, step=0.1
+            )
+            Curricular_units_2nd_sem_without_evaluations = st.number_input(
+                "Curricular_units_2nd_sem_without_evaluations", min_value=0, max_value=12, step=1
+            )
         
-    with col3:
-        Admission_grade = st.number_input("Admission Grade", 0.0, 200.0, 130.0)
-        Previous_qualification_grade = st.number_input("Nilai Kualifikasi Sebelumnya", 0.0, 200.0, 140.0)
-        Unemployment_rate = st.number_input(
-            "Unemployment_rate",
-            min_value=7.6,
-            max_value=16.2,
-            value=10.0,
-            step=0.1
-        )
-        Inflation_rate = st.number_input(
-            "Inflation_rate",
-            min_value=-0.8,
-            max_value=3.7,
-            value=1.0,
-            step=0.1
-        )
-        GDP = st.number_input(
-            "GDP",
-            min_value=-4.06,
-            max_value=3.51,
-            value=0.0,
-            step=0.1
+        with col3:
+            Admission_grade = st.number_input("Admission Grade", 0.0, 200.0, 130.0)
+            Previous_qualification_grade = st.number_input("Nilai Kualifikasi Sebelumnya", 0.0, 200.0, 140.0)
+            Unemployment_rate = st.number_input(
+                "Unemployment_rate",
+                min_value=7.6,
+                max_value=16.2,
+                value=10.0,
+                step=0.1
+            )
+            Inflation_rate = st.number_input(
+                "Inflation_rate",
+                min_value=-0.8,
+                max_value=3.7,
+                value=1.0,
+                step=0.1
+            )
+            GDP = st.number_input(
+                "GDP",
+                min_value=-4.06,
+                max_value=3.51,
+                value=0.0,
+                step=0.1
+            )
+            Daytime_evening_attendance = st.radio("Kehadiran", [0, 1], format_func=lambda x: "Daytime" if x == 0 else "Evening", horizontal=True)
+            Debtor = st.radio("Memiliki Hutang?", [0, 1], format_func=lambda x: "No" if x == 0 else "Yes", horizontal=True)
+            Scholarship_holder = st.radio("Penerima Beasiswa?", [0, 1], format_func=lambda x: "No" if x == 0 else "Yes", horizontal=True)
+            Displaced = st.radio("Mahasiswa Tergusur?", [0, 1], format_func=lambda x: "No" if x == 0 else "Yes", horizontal=True)
+            Gender = st.radio("Jenis Kelamin", [0, 1], format_func=lambda x: "Female" if x == 0 else "Male", horizontal=True)
+            Tuition_fees_up_to_date = st.radio("SPP Terbayar?", [0, 1], format_func=lambda x: "No" if x == 0 else "Yes", horizontal=True)
+            Educational_special_needs = st.radio("Berkebutuhan Khusus?", [0, 1], format_func=lambda x: "No" if x == 0 else "Yes", horizontal=True)
+            International = st.radio("Mahasiswa International?", [0, 1], format_func=lambda x: "No" if x == 0 else "Yes", horizontal=True)
+
+        submitted = st.form_submit_button("Prediksi")
+
+    if submitted:
+        raw_input = {
+            'Marital_status': Marital_status, 
+            'Application_mode': Application_mode, 
+            'Application_order': Application_order, 
+            'Course': Course, 
+            'Daytime_evening_attendance': Daytime_evening_attendance, 
+            'Previous_qualification': Previous_qualification, 
+            'Previous_qualification_grade': Previous_qualification_grade, 
+            'Nacionality': Nacionality, 
+            'Mothers_qualification': Mothers_qualification, 
+            'Fathers_qualification': Fathers_qualification, 
+            'Mothers_occupation': Mothers_occupation, 
+            'Fathers_occupation': Fathers_occupation, 
+            'Admission_grade': Admission_grade, 
+            'Displaced': Displaced, 
+            'Educational_special_needs': Educational_special_needs, 
+            'Debtor': Debtor, 
+            'Tuition_fees_up_to_date': Tuition_fees_up_to_date, 
+            'Gender': Gender, 
+            'Scholarship_holder': Scholarship_holder, 
+            'Age_at_enrollment': Age_at_enrollment, 
+            'International': International, 
+            'Curricular_units_1st_sem_credited': Curricular_units_1st_sem_credited, 
+            'Curricular_units_1st_sem_enrolled': Curricular_units_1st_sem_enrolled, 
+            'Curricular_units_1st_sem_evaluations': Curricular_units_1st_sem_evaluations, 
+            'Curricular_units_1st_sem_approved': Curricular_units_1st_sem_approved, 
+            'Curricular_units_1st_sem_grade': Curricular_units_1st_sem_grade, 
+            'Curricular_units_1st_sem_without_evaluations': Curricular_units_1st_sem_without_evaluations, 
+            'Curricular_units_2nd_sem_credited': Curricular_units_2nd_sem_credited, 
+            'Curricular_units_2nd_sem_enrolled': Curricular_units_2nd_sem_enrolled, 
+            'Curricular_units_2nd_sem_evaluations': Curricular_units_2nd_sem_evaluations, 
+            'Curricular_units_2nd_sem_approved': Curricular_units_2nd_sem_approved, 
+            'Curricular_units_2nd_sem_grade': Curricular_units_2nd_sem_grade, 
+            'Curricular_units_2nd_sem_without_evaluations': Curricular_units_2nd_sem_without_evaluations, 
+            'Unemployment_rate': Unemployment_rate, 
+            'Inflation_rate': Inflation_rate, 
+            'GDP': GDP
+        }
+
+        model, feature_names, result_cache = current_model()
+        metrics.count("requests", mode="form")
+        with metrics.timer("encode"):
+            features = scoring.assemble_features(raw_input)
+
+        prediction, probability, values = cached_predict(result_cache, model, feature_names, features, metrics)
+        if model_registry is not None:
+            model_registry.observe(features, prediction, probability)
+        contributions = pd.Series(values, index=feature_names)
+        st.session_state['last_raw_input'] = raw_input
+        st.session_state['last_prediction'] = prediction
+        st.session_state['last_probability'] = probability
+        st.session_state['last_contributions'] = contributions[contributions.abs().sort_values(ascending=False).index[:10]]
+
+    # Hasil terakhir dirender dari session_state supaya tetap tampil pada
+    # rerun tanpa submit, mis. rerun penuh saat polling job berhenti
+    if 'last_prediction' in st.session_state:
+        prediction = st.session_state['last_prediction']
+        st.success(f"🎯 Hasil Prediksi: {'🔴 Dropout' if prediction == 1 else '🟢 Lulus'}")
+        st.metric("Probabilitas Dropout", f"{st.session_state['last_probability']:.1%}")
+        st.write("Fitur paling berpengaruh (positif = mendorong ke arah Dropout):")
+        st.bar_chart(st.session_state['last_contributions'], horizontal=True)
+        stats = current_model()[2].stats()
+        st.caption(f"Cache prediksi: {stats['hits']} hit, {stats['misses']} miss, {stats['size']}/{stats['maxsize']} entri")
+
+    what_if_panel()
+
+# Panel what-if hanya rerun sendiri saat field diganti, tidak memicu form
+@st.fragment
+@timed_fragment("rerun_what_if")
+def what_if_panel():
+    raw = st.session_state.get('last_raw_input')
+    if raw is None:
+        return
+    model, feature_names, _ = current_model()
+    st.subheader("🔍 Analisis What-If")
+    st.write("Variasikan beberapa field dari data terakhir dan lihat apakah prediksinya berubah.")
+    fields = st.multiselect(
+        "Field yang divariasikan",
+        list(WHAT_IF_FIELDS),
+        default=['Curricular_units_2nd_sem_approved', 'Tuition_fees_up_to_date'],
+        max_selections=3,
+    )
+    if not fields:
+        return
+
+    with metrics.timer("what_if"):
+        grid = sweep(model, feature_names, raw, {field: WHAT_IF_FIELDS[field] for field in fields})
+    grid['Berubah'] = grid['Prediction'] != st.session_state['last_prediction']
+    st.caption(f"{len(grid)} variasi diprediksi sekaligus, {int(grid['Berubah'].sum())} mengubah hasil prediksi.")
+
+    if len(fields) == 2:
+        st.altair_chart(
+            alt.Chart(grid).mark_rect().encode(
+                x=alt.X(f"{fields[0]}:O"),
+                y=alt.Y(f"{fields[1]}:O", sort='descending'),
+                color=alt.Color("Dropout_probability:Q", scale=alt.Scale(scheme='redyellowgreen', reverse=True, domain=[0, 1])),
+                tooltip=fields + ['Dropout_probability'],
+            )
         )
-        Daytime_evening_attendance = st.radio("Kehadiran", [0, 1], format_func=lambda x: "Daytime" if x == 0 else "Evening", horizontal=True)
-        Debtor = st.radio("Memiliki Hutang?", [0, 1], format_func=lambda x: "No" if x == 0 else "Yes", horizontal=True)
-        Scholarship_holder = st.radio("Penerima Beasiswa?", [0, 1], format_func=lambda x: "No" if x == 0 else "Yes", horizontal=True)
-        Displaced = st.radio("Mahasiswa Tergusur?", [0, 1], format_func=lambda x: "No" if x == 0 else "Yes", horizontal=True)
-        Gender = st.radio("Jenis Kelamin", [0, 1], format_func=lambda x: "Female" if x == 0 else "Male", horizontal=True)
-        Tuition_fees_up_to_date = st.radio("SPP Terbayar?", [0, 1], format_func=lambda x: "No" if x == 0 else "Yes", horizontal=True)
-        Educational_special_needs = st.radio("Berkebutuhan Khusus?", [0, 1], format_func=lambda x: "No" if x == 0 else "Yes", horizontal=True)
-        International = st.radio("Mahasiswa International?", [0, 1], format_func=lambda x: "No" if x == 0 else "Yes", horizontal=True)
-
-    submitted = st.form_submit_button("Prediksi")
-
-if submitted:
-    raw_input = {
-        'Marital_status': Marital_status, 
-        'Application_mode': Application_mode, 
-        'Application_order': Application_order, 
-        'Course': Course, 
-        'Daytime_evening_attendance': Daytime_evening_attendance, 
-        'Previous_qualification': Previous_qualification, 
-        'Previous_qualification_grade': Previous_qualification_grade, 
-        'Nacionality': Nacionality, 
-        'Mothers_qualification': Mothers_qualification, 
-        'Fathers_qualification': Fathers_qualification, 
-        'Mothers_occupation': Mothers_occupation, 
-        'Fathers_occupation': Fathers_occupation, 
-        'Admission_grade': Admission_grade, 
-        'Displaced': Displaced, 
-        'Educational_special_needs': Educational_special_needs, 
-        'Debtor': Debtor, 
-        'Tuition_fees_up_to_date': Tuition_fees_up_to_date, 
-        'Gender': Gender, 
-        'Scholarship_holder': Scholarship_holder, 
-        'Age_at_enrollment': Age_at_enrollment, 
-        'International': International, 
-        'Curricular_units_1st_sem_credited': Curricular_units_1st_sem_credited, 
-        'Curricular_units_1st_sem_enrolled': Curricular_units_1st_sem_enrolled, 
-        'Curricular_units_1st_sem_evaluations': Curricular_units_1st_sem_evaluations, 
-        'Curricular_units_1st_sem_approved': Curricular_units_1st_sem_approved, 
-        'Curricular_units_1st_sem_grade': Curricular_units_1st_sem_grade, 
-        'Curricular_units_1st_sem_without_evaluations': Curricular_units_1st_sem_without_evaluations, 
-        'Curricular_units_2nd_sem_credited': Curricular_units_2nd_sem_credited, 
-        'Curricular_units_2nd_sem_enrolled': Curricular_units_2nd_sem_enrolled, 
-        'Curricular_units_2nd_sem_evaluations': Curricular_units_2nd_sem_evaluations, 
-        'Curricular_units_2nd_sem_approved': Curricular_units_2nd_sem_approved, 
-        'Curricular_units_2nd_sem_grade': Curricular_units_2nd_sem_grade, 
-        'Curricular_units_2nd_sem_without_evaluations': Curricular_units_2nd_sem_without_evaluations, 
-        'Unemployment_rate': Unemployment_rate, 
-        'Inflation_rate': Inflation_rate, 
-        'GDP': GDP
-    }
-
-    features = preprocess_input_raw(raw_input)
-
-    features.update({
-        'Marital_status': Marital_status, 
-        'Application_order': Application_order, 
-        'Daytime_evening_attendance': Daytime_evening_attendance, 
-        'Displaced': Displaced, 
-        'Educational_special_needs': Educational_special_needs, 
-        'Debtor': Debtor, 
-        'Tuition_fees_up_to_date': Tuition_fees_up_to_date, 
-        'Gender': Gender, 
-        'Scholarship_holder': Scholarship_holder, 
-        'International': International, 
-        'Curricular_units_1st_sem_credited': Curricular_units_1st_sem_credited, 
-        'Curricular_units_1st_sem_enrolled': Curricular_units_1st_sem_enrolled, 
-        'Curricular_units_1st_sem_evaluations': Curricular_units_1st_sem_evaluations, 
-        'Curricular_units_1st_sem_approved': Curricular_units_1st_sem_approved, 
-        'Curricular_units_1st_sem_without_evaluations': Curricular_units_1st_sem_without_evaluations, 
-        'Curricular_units_2nd_sem_credited': Curricular_units_2nd_sem_credited, 
-        'Curricular_units_2nd_sem_enrolled': Curricular_units_2nd_sem_enrolled, 
-        'Curricular_units_2nd_sem_evaluations': Curricular_units_2nd_sem_evaluations, 
-        'Curricular_units_2nd_sem_approved': Curricular_units_2nd_sem_approved, 
-        'Curricular_units_2nd_sem_without_evaluations': Curricular_units_2nd_sem_without_evaluations, 
-        'Unemployment_rate': Unemployment_rate, 
-        'Inflation_rate': Inflation_rate, 
-        'GDP': GDP
-    })
-
-    input_df = pd.DataFrame([features])[feature_names]
-
-    prediction = model.predict(input_df)[0]
-
-    st.success(f"🎯 Hasil Prediksi: {'🔴 Dropout' if prediction == 1 else '🟢 Lulus'}")
\ No newline at end of file
+    elif len(fields) == 1:
+        st.line_chart(grid.set_index(fields[0])['Dropout_probability'])
+    st.dataframe(grid, hide_index=True)
+
+with tab_form:
+    input_form()
+
+@st.cache_resource
+def get_job_manager():
+    return JobManager(
+        os.environ.get("JOBS_DIR", "jobs"),
+        MODEL_PATH,
+        engine=MODEL_ENGINE,
+        chunk_size=BATCH_CHUNK_SIZE,
+        metrics=metrics,
+        registry=get_model_registry() if MODEL_DIR else None,
+        drift_reference=FeatureHistogram.load(os.environ["DRIFT_REFERENCE"]) if os.environ.get("DRIFT_REFERENCE") else None,
+    )
+
+job_manager = get_job_manager()
+
+JOB_STATUS_LABELS = {QUEUED: "⏳ Antre", RUNNING: "⚙️ Diproses", DONE: "✅ Selesai", FAILED: "❌ Gagal"}
+
+def job_statuses():
+    return {job_id: job_manager.status(job_id) for job_id in st.session_state.get('jobs', [])}
+
+def has_active_jobs(jobs):
+    return any(job['status'] in (QUEUED, RUNNING) for job in jobs.values())
+
+def read_result(job_id):
+    with open(job_manager.result_path(job_id), "rb") as f:
+        return f.read()
+
+# Dipanggil sebagai fragment dengan run_every hanya selama ada job yang
+# antre atau diproses; begitu semua selesai, rerun penuh menghentikan polling
+def show_jobs(polling):
+    jobs = job_statuses()
+    if not jobs:
+        st.caption("Belum ada file dalam antrean.")
+        return
+    for job_id in reversed(list(jobs)):
+        job = jobs[job_id]
+        st.write(f"**{job['name']}** · {JOB_STATUS_LABELS[job['status']]}")
+        total = max(job['total_rows'], 1)
+        st.progress(min(job['rows_done'] / total, 1.0), text=f"{job['rows_done']}/{job['total_rows']} baris · {job['throughput']:.0f} baris/dtk")
+        if job['status'] == DONE:
+            st.success(f"🎯 {job['rows_done']} mahasiswa diprediksi: 🔴 {job['dropouts']} Dropout, 🟢 {job['rows_done'] - job['dropouts']} Lulus")
+            # File hasil baru dibaca saat tombol diklik, bukan di setiap rerun
+            st.download_button(
+                "Unduh Hasil (CSV)",
+                functools.partial(read_result, job_id),
+                file_name=f"prediksi_{job['name'].rsplit('.', 1)[0]}.csv",
+                mime="text/csv",
+                key=f"download_{job_id}",
+            )
+            drift = job_manager.drift_report(job_id)
+            if drift is not None:
+                alerts = drift[drift['level'] != DRIFT_LEVELS[0]]
+                if len(alerts):
+                    st.warning(f"⚠️ Distribusi input bergeser dari data referensi pada {len(alerts)} fitur: "
+                               + ", ".join(f"{row.feature} ({row.level}, PSI {row.psi:.2f})" for row in alerts.head(5).itertuples()))
+        elif job['status'] == FAILED:
+            st.error(job['error'])
+    if polling and not has_active_jobs(jobs):
+        st.rerun()
+
+@st.fragment
+@timed_fragment("rerun_file")
+def file_panel():
+    st.write("Unggah file CSV atau Parquet dengan kolom yang sama seperti input manual. File diproses di latar belakang, jadi halaman tetap bisa dipakai selama prediksi berjalan.")
+    uploaded_files = st.file_uploader("File Mahasiswa", type=["csv", "parquet"], accept_multiple_files=True)
+    explain_features = st.checkbox("Sertakan kontribusi per fitur")
+
+    if uploaded_files and st.button("Antrekan File"):
+        for uploaded in uploaded_files:
+            try:
+                job_id = job_manager.submit(uploaded.name, uploaded.getvalue(), explain_features)
+            except Exception as e:
+                st.error(f"{uploaded.name}: {e}")
+                continue
+            metrics.count("requests", mode="file")
+            st.session_state.setdefault('jobs', []).append(job_id)
+
+    polling = has_active_jobs(job_statuses())
+    st.fragment(show_jobs, run_every=2 if polling else None)(polling)
+
+with tab_file:
+    file_panel()
+
+if model_registry is not None:
+    with st.sidebar.expander("Model (admin)"):
+        status = model_registry.status()
+        st.write(f"Versi aktif: **{status['active']}**")
+        if status['candidate']:
+            st.write(f"Kandidat (shadow): **{status['candidate']}**")
+            st.json(status['shadow'])
+            if st.button("Promosikan kandidat"):
+                model_registry.promote()
+                st.rerun()
+        for version, error in status['errors'].items():
+            st.error(f"{version}: {error}")
+
+if metrics.enabled:
+    with st.sidebar.expander("Metrik Latensi (admin)"):
+        summary = metrics.summary()
+        if summary:
+            st.dataframe(pd.DataFrame(summary).set_index('stage').round(3))
+        else:
+            st.write("Belum ada data.")
+        st.download_button("Unduh Metrik (Prometheus)", metrics.prometheus_text(), file_name="metrics.txt", mime="text/plain")
+    metrics.observe("rerun", time.perf_counter() - rerun_start)
+
+report = stop_profile(profiler)
+if report is not None:
+    with st.sidebar.expander("Profil Rerun (debug)"):
+        st.caption(f"Rerun penuh: {(time.perf_counter() - rerun_start) * 1000:.0f} ms")
+        st.code(report)
@@ -0,0 +1,145 @@
+import argparse
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from drift import DRIFT_LEVELS, FeatureHistogram, drift_scores, format_report
+from preprocessing import FLOAT_COLUMNS, build_feature_frame, missing_raw_columns
+from scoring import ENGINES, MODEL_PATH, load_model, score_features
+
+DEFAULT_CHUNK_SIZE = 50000
+
+# Model dimuat sekali per proses worker oleh init_worker
+_model = None
+_feature_names = None
+
+
+def init_worker(model_path, engine='sklearn'):
+    global _model, _feature_names
+    _model, _feature_names = load_model(model_path, engine)
+
+
+def score_shard(raw_df, explain_features=False, drift_edges=None):
+    # Histogram drift dihitung di worker dari matriks fitur yang sama dengan
+    # yang diprediksi; yang dikirim balik hanya counter berukuran tetap
+    X = build_feature_frame(raw_df, _feature_names)
+    result = score_features(_model, _feature_names, raw_df, X, explain_features)
+    counts = FeatureHistogram(drift_edges).update(X).counts if drift_edges is not None else None
+    return result, counts
+
+
+def is_parquet(path):
+    return path.lower().endswith(".parquet")
+
+
+def iter_shards(path, chunk_size):
+    if is_parquet(path):
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunk_size, dtype=dict.fromkeys(FLOAT_COLUMNS, "float64"))
+
+
+class ResultWriter:
+    def __init__(self, path):
+        self.path = path
+        self.rows = 0
+        self._parquet = None
+
+    def write(self, result):
+        if is_parquet(self.path):
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            if self._parquet is None:
+                table = pa.Table.from_pandas(result, preserve_index=False)
+                self._parquet = pq.ParquetWriter(self.path, table.schema)
+            else:
+                table = pa.Table.from_pandas(result, schema=self._parquet.schema, preserve_index=False)
+            self._parquet.write_table(table)
+        else:
+            result.to_csv(self.path, mode="w" if self.rows == 0 else "a", header=self.rows == 0, index=False)
+        self.rows += len(result)
+
+    def close(self):
+        if self._parquet is not None:
+            self._parquet.close()
+
+
+def check_columns(raw_df):
+    missing = missing_raw_columns(raw_df)
+    if missing:
+        raise ValueError(f"Kolom tidak ditemukan: {', '.join(missing)}")
+    return raw_df
+
+
+def run(input_path, output_path, model_path=MODEL_PATH, workers=None, chunk_size=DEFAULT_CHUNK_SIZE, engine='sklearn', explain_features=False, drift_reference=None):
+    workers = workers or os.cpu_count() or 1
+    shards = (check_columns(shard) for shard in iter_shards(input_path, chunk_size))
+    writer = ResultWriter(output_path)
+    drift = drift_reference.empty_like() if drift_reference is not None else None
+    drift_edges = drift_reference.edges if drift_reference is not None else None
+
+    def collect(scored):
+        result, counts = scored
+        writer.write(result)
+        if drift is not None:
+            drift.merge(counts, len(result))
+
+    try:
+        if workers == 1:
+            init_worker(model_path, engine)
+            for shard in shards:
+                collect(score_shard(shard, explain_features, drift_edges))
+            return writer.rows, drift
+
+        # Jumlah shard yang sedang diproses dibatasi supaya file besar tidak
+        # dibaca seluruhnya ke memori; hasil ditulis sesuai urutan input
+        max_pending = workers * 2
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(model_path, engine)) as pool:
+            pending = deque()
+            for shard in shards:
+                pending.append(pool.submit(score_shard, shard, explain_features, drift_edges))
+                if len(pending) >= max_pending:
+                    collect(pending.popleft().result())
+            while pending:
+                collect(pending.popleft().result())
+        return writer.rows, drift
+    finally:
+        writer.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Prediksi dropout untuk file CSV/Parquet berukuran besar.")
+    parser.add_argument("input", help="File input CSV atau Parquet dengan kolom mentah mahasiswa")
+    parser.add_argument("output", help="File output CSV atau Parquet")
+    parser.add_argument("--model", default=MODEL_PATH, help="Path artefak model (default: %(default)s)")
+    parser.add_argument("--workers", type=int, default=None, help="Jumlah proses worker (default: jumlah core)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Jumlah baris per shard (default: %(default)s)")
+    parser.add_argument("--engine", choices=ENGINES, default='sklearn', help="Engine inferensi (default: %(default)s)")
+    parser.add_argument("--explain", action="store_true", help="Tambahkan kolom kontribusi per fitur (contrib_*)")
+    parser.add_argument("--drift-reference", help="Profil referensi (lihat drift.py) untuk memantau drift input")
+    args = parser.parse_args(argv)
+
+    drift_reference = FeatureHistogram.load(args.drift_reference) if args.drift_reference else None
+    try:
+        rows, drift = run(args.input, args.output, args.model, args.workers, args.chunk_size, args.engine, args.explain, drift_reference)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 1
+    print(f"{rows} baris diprediksi -> {args.output}")
+    if drift is not None and drift.rows:
+        scores = drift_scores(drift_reference, drift)
+        print(format_report(scores, drift.rows))
+        if (scores['level'] == DRIFT_LEVELS[2]).any():
+            return 2
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,191 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from preprocessing import PASSTHROUGH_COLUMNS, build_feature_frame, preprocess_input_frame, preprocess_input_raw
+from scoring import ENGINES, MODEL_PATH, load_model
+from synthetic_data import generate_students
+
+BATCH_SIZES = (1, 16, 256, 4096)
+DEFAULT_TOLERANCE = 0.10
+
+# Semua metrik "lebih kecil lebih baik"; satuan ada di akhir nama metrik
+
+COLD_LOAD_SCRIPT = """
+import json, resource, sys, time
+sys.path.insert(0, {repo!r})
+import scoring
+# Unpickle model sklearn ikut mengimpor sklearn; diimpor di sini agar
+# waktu import tidak masuk ke waktu muat
+import sklearn.ensemble
+start = time.perf_counter()
+scoring.load_model({path!r}, {engine!r})
+elapsed = time.perf_counter() - start
+print(json.dumps({{'ms': elapsed * 1000, 'maxrss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss}}))
+"""
+
+
+def time_per_call(fn, repeat=5, min_time=0.2):
+    # Jumlah pemanggilan per ulangan ditambah sampai satu ulangan >= min_time,
+    # lalu diambil median dari beberapa ulangan
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        number *= 2
+    timings = [elapsed / number]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        timings.append((time.perf_counter() - start) / number)
+    return statistics.median(timings)
+
+
+def bench_preprocessing(students):
+    records = students.to_dict('records')
+    metrics = {}
+    metrics['preprocess_input_raw.us_per_row'] = time_per_call(lambda: [preprocess_input_raw(r) for r in records]) / len(records) * 1e6
+    metrics['preprocess_input_frame.us_per_row'] = time_per_call(lambda: preprocess_input_frame(students)) / len(students) * 1e6
+    return metrics
+
+
+def bench_assembly(students, feature_names):
+    records = students.to_dict('records')
+    encoded = [preprocess_input_raw(r) for r in records]
+
+    # Sama dengan jalur form di app.py: features.update lalu DataFrame satu baris
+    def assemble():
+        for raw, features in zip(records, encoded):
+            features = dict(features)
+            features.update({column: raw[column] for column in PASSTHROUGH_COLUMNS})
+            pd.DataFrame([features])[feature_names]
+
+    X = build_feature_frame(students, feature_names)
+    return {
+        'assemble_single_row.us_per_row': time_per_call(assemble) / len(records) * 1e6,
+        'build_feature_frame.us_per_row': time_per_call(lambda: build_feature_frame(students, feature_names)) / len(students) * 1e6,
+        'build_feature_frame.bytes_per_row': X.memory_usage(index=False).sum() / len(X),
+    }
+
+
+def bench_predict(model, feature_names, students, engine):
+    metrics = {}
+    for batch_size in BATCH_SIZES:
+        X = build_feature_frame(students.iloc[:batch_size], feature_names)
+        per_call = time_per_call(lambda: model.predict(X))
+        prefix = f'predict.{engine}.batch_{batch_size}'
+        metrics[f'{prefix}.ms_per_call'] = per_call * 1e3
+        metrics[f'{prefix}.us_per_row'] = per_call / batch_size * 1e6
+
+    X = build_feature_frame(students.iloc[:max(BATCH_SIZES)], feature_names)
+    tracemalloc.start()
+    model.predict(X)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    metrics[f'predict.{engine}.batch_{max(BATCH_SIZES)}.peak_alloc_mb'] = peak / 2 ** 20
+    return metrics
+
+
+def bench_cold_load(model_path, engine, repeat=3):
+    # Dijalankan di proses baru agar tidak ada cache; waktu import tidak dihitung
+    repo = os.path.dirname(os.path.abspath(__file__))
+    script = COLD_LOAD_SCRIPT.format(repo=repo, path=os.path.abspath(model_path), engine=engine)
+    runs = []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, "-c", script], check=True, capture_output=True, text=True).stdout
+        runs.append(json.loads(output.strip().splitlines()[-1]))
+    return {
+        f'load_model.{engine}.cold_ms': statistics.median(run['ms'] for run in runs),
+        f'load_model.{engine}.peak_rss_mb': max(run['maxrss_kb'] for run in runs) / 1024,
+    }
+
+
+def run(model_path=MODEL_PATH, engines=('sklearn',), n_students=4096, seed=0):
+    students = generate_students(max(n_students, max(BATCH_SIZES)), seed=seed)
+    metrics = {}
+    metrics.update(bench_preprocessing(students.iloc[:1000]))
+
+    for engine in engines:
+        model, feature_names = load_model(model_path, engine)
+        if engine == engines[0]:
+            metrics.update(bench_assembly(students.iloc[:1000], feature_names))
+        metrics.update(bench_predict(model, feature_names, students, engine))
+        metrics.update(bench_cold_load(model_path, engine))
+
+    import sklearn
+
+    meta = {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'sklearn': sklearn.__version__,
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'model': os.path.abspath(model_path),
+    }
+    return {'meta': meta, 'metrics': metrics}
+
+
+def compare(metrics, baseline_metrics, tolerance=DEFAULT_TOLERANCE):
+    rows = []
+    for name, value in metrics.items():
+        base = baseline_metrics.get(name)
+        if base is None or base == 0:
+            continue
+        ratio = value / base
+        rows.append((name, base, value, ratio, ratio > 1 + tolerance))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark preprocessing, perakitan fitur dan prediksi model.")
+    parser.add_argument("--model", default=MODEL_PATH, help="Path artefak model (default: %(default)s)")
+    parser.add_argument("--engine", choices=ENGINES + ('all',), default='sklearn', help="Engine yang diukur (default: %(default)s)")
+    parser.add_argument("--output", help="Simpan hasil sebagai JSON ke file ini")
+    parser.add_argument("--baseline", help="File JSON hasil sebelumnya untuk dibandingkan")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="Batas kenaikan relatif sebelum dianggap regresi (default: %(default)s)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    engines = ENGINES if args.engine == 'all' else (args.engine,)
+    result = run(args.model, engines, seed=args.seed)
+
+    width = max(len(name) for name in result['metrics'])
+    for name, value in result['metrics'].items():
+        print(f"{name:<{width}}  {value:12.3f}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        rows = compare(result['metrics'], baseline['metrics'], args.tolerance)
+        regressions = [row for row in rows if row[4]]
+        print()
+        for name, base, value, ratio, regressed in rows:
+            print(f"{name:<{width}}  {base:12.3f} -> {value:12.3f}  ({ratio:5.2f}x){'  REGRESI' if regressed else ''}")
+        if regressions:
+            print(f"\n{len(regressions)} metrik melebihi toleransi {args.tolerance:.0%}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,164 @@
+import argparse
+import json
+import sys
+
+import numpy as np
+import pandas as pd
+
+from preprocessing import build_feature_frame
+from scoring import MODEL_PATH, load_model
+
+DEFAULT_MAX_BINS = 10
+PSI_WARNING = 0.1
+PSI_ALERT = 0.2
+EPSILON = 1e-4
+
+DRIFT_LEVELS = {0: 'OK', 1: 'WASPADA', 2: 'DRIFT'}
+
+# Setiap fitur punya batas bin tetap dari profil referensi; bin ke-i berisi
+# nilai di (edges[i-1], edges[i]] dan bin terakhir menampung nilai di atas
+# batas tertinggi. Fitur diskrit (nilai unik <= max_bins) mendapat satu bin
+# per nilai, fitur kontinu memakai batas kuantil. Memori per fitur tetap
+# len(edges) + 1 counter berapa pun jumlah baris yang dipantau.
+
+
+def bin_edges(values, max_bins=DEFAULT_MAX_BINS):
+    values = np.asarray(values, dtype=float)
+    values = values[np.isfinite(values)]
+    unique = np.unique(values)
+    if len(unique) <= max_bins:
+        return unique
+    return np.unique(np.quantile(values, np.linspace(0, 1, max_bins + 1)[1:]))
+
+
+class FeatureHistogram:
+    def __init__(self, edges):
+        self.edges = edges
+        self.counts = {column: np.zeros(len(e) + 1, dtype=np.int64) for column, e in edges.items()}
+        self.rows = 0
+
+    def update(self, X):
+        # Profil harus dibuat dari kolom input model yang sama (feature_names)
+        missing = [column for column in self.edges if column not in X.columns]
+        if missing:
+            raise ValueError(f"Kolom profil referensi tidak dipakai model: {', '.join(missing)}")
+        for column, edges in self.edges.items():
+            bins = np.searchsorted(edges, np.asarray(X[column], dtype=float), side='left')
+            self.counts[column] += np.bincount(bins, minlength=len(edges) + 1)
+        self.rows += len(X)
+        return self
+
+    def merge(self, counts, rows):
+        for column, values in counts.items():
+            self.counts[column] += np.asarray(values, dtype=np.int64)
+        self.rows += rows
+        return self
+
+    def to_dict(self):
+        return {
+            'rows': self.rows,
+            'edges': {column: edges.tolist() for column, edges in self.edges.items()},
+            'counts': {column: counts.tolist() for column, counts in self.counts.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        histogram = cls({column: np.asarray(edges, dtype=float) for column, edges in data['edges'].items()})
+        return histogram.merge(data['counts'], data['rows'])
+
+    def save(self, path):
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f)
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
+
+    def empty_like(self):
+        return FeatureHistogram(self.edges)
+
+
+def reference_profile(X, max_bins=DEFAULT_MAX_BINS):
+    return FeatureHistogram({column: bin_edges(X[column], max_bins) for column in X.columns}).update(X)
+
+
+def drift_scores(reference, current):
+    rows = []
+    for column, expected in reference.counts.items():
+        actual = current.counts[column]
+        e = np.clip(expected / max(expected.sum(), 1), EPSILON, None)
+        a = np.clip(actual / max(actual.sum(), 1), EPSILON, None)
+        psi = float(np.sum((a - e) * np.log(a / e)))
+        ks = float(np.max(np.abs(np.cumsum(actual) / max(actual.sum(), 1) - np.cumsum(expected) / max(expected.sum(), 1))))
+        level = 2 if psi >= PSI_ALERT else 1 if psi >= PSI_WARNING else 0
+        rows.append({'feature': column, 'psi': psi, 'ks': ks, 'level': DRIFT_LEVELS[level]})
+    return pd.DataFrame(rows).sort_values('psi', ascending=False, ignore_index=True)
+
+
+def format_report(scores, rows):
+    alerts = scores[scores['level'] != DRIFT_LEVELS[0]]
+    lines = [f"Drift pada {rows} baris: {int((scores['level'] == DRIFT_LEVELS[2]).sum())} DRIFT, {int((scores['level'] == DRIFT_LEVELS[1]).sum())} WASPADA"]
+    for row in alerts.itertuples():
+        lines.append(f"  {row.level:<8} {row.feature:<45} PSI={row.psi:.3f} KS={row.ks:.3f}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    from batch_score import DEFAULT_CHUNK_SIZE, check_columns, iter_shards
+
+    parser = argparse.ArgumentParser(description="Profil referensi dan pemantauan drift distribusi input model.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    reference = subparsers.add_parser("reference", help="Buat profil referensi dari data (mis. data latih)")
+    reference.add_argument("input", help="File CSV/Parquet berisi data mahasiswa mentah")
+    reference.add_argument("--output", required=True, help="File JSON profil referensi")
+    reference.add_argument("--max-bins", type=int, default=DEFAULT_MAX_BINS)
+
+    check = subparsers.add_parser("check", help="Bandingkan data baru dengan profil referensi")
+    check.add_argument("input", help="File CSV/Parquet berisi data mahasiswa mentah")
+    check.add_argument("--reference", required=True, help="File JSON profil referensi")
+    check.add_argument("--report", help="Simpan skor drift per fitur sebagai CSV")
+
+    for sub in (reference, check):
+        sub.add_argument("--model", default=MODEL_PATH, help="Model yang kolom inputnya (feature_names) diprofilkan (default: %(default)s)")
+        sub.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args(argv)
+
+    _, feature_names = load_model(args.model)
+    shards = (build_feature_frame(check_columns(shard), feature_names) for shard in iter_shards(args.input, args.chunk_size))
+
+    try:
+        if args.command == "reference":
+            # Batas bin diambil dari shard pertama yang berisi data, lalu
+            # semua shard dihitung
+            profile = None
+            for X in shards:
+                if profile is None and len(X):
+                    profile = reference_profile(X, args.max_bins)
+                elif profile is not None:
+                    profile.update(X)
+            if profile is None:
+                raise ValueError(f"Tidak ada baris data di {args.input}")
+            profile.save(args.output)
+            print(f"Profil referensi {profile.rows} baris -> {args.output}")
+            return 0
+
+        reference_histogram = FeatureHistogram.load(args.reference)
+        current = reference_histogram.empty_like()
+        for X in shards:
+            current.update(X)
+        if current.rows == 0:
+            raise ValueError(f"Tidak ada baris data di {args.input}")
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 1
+    scores = drift_scores(reference_histogram, current)
+    if args.report:
+        scores.to_csv(args.report, index=False)
+    print(format_report(scores, current.rows))
+    return 2 if (scores['level'] == DRIFT_LEVELS[2]).any() else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
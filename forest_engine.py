@@ -0,0 +1,154 @@
+import argparse
+
+import numpy as np
+
+
+class CompiledForest:
+    # Random forest sklearn yang diratakan ke array numpy kontigu. Semua node
+    # dari semua pohon disimpan dalam satu array; roots[t] adalah indeks node
+    # akar pohon ke-t. Daun menunjuk ke dirinya sendiri sehingga penelusuran
+    # cukup diulang sebanyak max_depth langkah.
+
+    def __init__(self, feature, threshold, left, right, missing_left, value, roots, max_depth, classes, n_features):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.missing_left = missing_left
+        self.value = value
+        self.roots = roots
+        self.max_depth = max_depth
+        self.classes_ = classes
+        self.n_features_in_ = n_features
+
+    @classmethod
+    def from_sklearn(cls, model):
+        if getattr(model, 'n_outputs_', 1) != 1:
+            raise ValueError("Hanya model dengan satu output yang didukung")
+
+        n_classes = len(model.classes_)
+        feature, threshold, left, right, missing_left, value, roots = [], [], [], [], [], [], []
+        offset = 0
+        max_depth = 0
+        for estimator in model.estimators_:
+            tree = estimator.tree_
+            nodes = np.arange(tree.node_count)
+            is_leaf = tree.children_left == -1
+            roots.append(offset)
+            feature.append(np.where(is_leaf, 0, tree.feature))
+            threshold.append(np.where(is_leaf, 0.0, tree.threshold))
+            left.append(np.where(is_leaf, nodes, tree.children_left) + offset)
+            right.append(np.where(is_leaf, nodes, tree.children_right) + offset)
+            missing_left.append(np.asarray(getattr(tree, 'missing_go_to_left', np.zeros(tree.node_count)), dtype=bool))
+
+            # Sama dengan DecisionTreeClassifier.predict_proba: nilai node dinormalisasi per baris
+            proba = np.array(tree.value[:, 0, :n_classes], dtype=np.float64)
+            normalizer = proba.sum(axis=1)
+            normalizer[normalizer == 0.0] = 1.0
+            value.append(proba / normalizer[:, None])
+
+            offset += tree.node_count
+            max_depth = max(max_depth, tree.max_depth)
+
+        return cls(
+            feature=np.ascontiguousarray(np.concatenate(feature), dtype=np.intp),
+            threshold=np.ascontiguousarray(np.concatenate(threshold), dtype=np.float64),
+            left=np.ascontiguousarray(np.concatenate(left), dtype=np.intp),
+            right=np.ascontiguousarray(np.concatenate(right), dtype=np.intp),
+            missing_left=np.ascontiguousarray(np.concatenate(missing_left)),
+            value=np.ascontiguousarray(np.concatenate(value)),
+            roots=np.asarray(roots, dtype=np.intp),
+            max_depth=max_depth,
+            classes=np.asarray(model.classes_),
+            n_features=model.n_features_in_,
+        )
+
+    @property
+    def n_trees(self):
+        return len(self.roots)
+
+    def _as_matrix(self, X):
+        # sklearn membandingkan fitur dalam float32 terhadap threshold float64
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X[None, :]
+        if X.shape[1] != self.n_features_in_:
+            raise ValueError(f"Jumlah fitur {X.shape[1]} tidak sama dengan {self.n_features_in_}")
+        return X
+
+    def _step(self, X, rows, nodes):
+        x = X[rows, self.feature[nodes]]
+        go_left = np.where(np.isnan(x), self.missing_left[nodes], x <= self.threshold[nodes])
+        return np.where(go_left, self.left[nodes], self.right[nodes])
+
+    def apply(self, X):
+        X = self._as_matrix(X)
+        rows = np.arange(len(X))[:, None]
+        nodes = np.repeat(self.roots[None, :], len(X), axis=0)
+        for _ in range(self.max_depth):
+            nodes = self._step(X, rows, nodes)
+        return nodes
+
+    def contributions(self, X, class_index=-1):
+        # Dekomposisi jalur pohon (Saabas): setiap split menyumbang selisih
+        # nilai node anak dan node induk ke fitur yang dipakai split itu.
+        # bias + contributions.sum(axis=1) == predict_proba(X)[:, class_index]
+        X = self._as_matrix(X)
+        n_rows, n_features = X.shape
+        rows = np.arange(n_rows)[:, None]
+        offsets = rows * n_features
+        value = np.ascontiguousarray(self.value[:, class_index])
+        nodes = np.repeat(self.roots[None, :], n_rows, axis=0)
+        total = np.zeros(n_rows * n_features)
+        for _ in range(self.max_depth):
+            children = self._step(X, rows, nodes)
+            delta = value[children] - value[nodes]
+            total += np.bincount((offsets + self.feature[nodes]).ravel(), weights=delta.ravel(), minlength=len(total))
+            nodes = children
+        bias = value[self.roots].mean()
+        return bias, total.reshape(n_rows, n_features) / self.n_trees
+
+    def predict_proba(self, X):
+        leaves = self.apply(X)
+        # Dijumlahkan per pohon berurutan seperti RandomForestClassifier agar
+        # hasil pembulatan (dan penentuan seri) identik
+        proba = np.zeros((len(leaves), self.value.shape[1]))
+        for t in range(self.n_trees):
+            proba += self.value[leaves[:, t]]
+        proba /= self.n_trees
+        return proba
+
+    def predict(self, X):
+        return self.classes_.take(np.argmax(self.predict_proba(X), axis=1), axis=0)
+
+
+def compile_forest(model):
+    return CompiledForest.from_sklearn(model)
+
+
+def feature_vector(features, feature_names):
+    return np.array([features[name] for name in feature_names], dtype=np.float32)
+
+
+def main(argv=None):
+    import pandas as pd
+
+    from preprocessing import build_feature_frame
+    from scoring import MODEL_PATH, load_model
+
+    parser = argparse.ArgumentParser(description="Verifikasi engine numpy terhadap model.predict sklearn.")
+    parser.add_argument("input", help="File CSV berisi data mahasiswa mentah")
+    parser.add_argument("--model", default=MODEL_PATH, help="Path artefak model (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    model, feature_names = load_model(args.model)
+    X = build_feature_frame(pd.read_csv(args.input), feature_names)
+    expected = model.predict(X)
+    actual = compile_forest(model).predict(X)
+    mismatches = int((expected != actual).sum())
+    print(f"{len(X)} baris, {mismatches} prediksi berbeda")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
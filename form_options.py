@@ -0,0 +1,144 @@
+# Tabel kode -> label untuk pilihan di form input
+
+marital_dict = {
+    1: "#1 Single", 2: "#2 Married", 3: "#3 Widower", 4: "#4 Divorced",
+    5: "#5 Facto Union", 6: "#6 Legally Separated"
+}
+
+app_mode_dict = {
+    1: "#1 1st Phase - General", 2: "#2 Ordinance 612/93", 5: "#5 Special - Azores", 7: "#7 Holders of other higher courses", 10: "#10 Ordinance 854-B/99",
+    15: "#15 International Student", 16: "#16 1st phase - special contingent", 17: "#17 2nd Phase", 18: "#18 3rd Phase", 26: "#26 Ordinance No. 533-A/99, item b2",
+    27: "#27 Ordinance No. 533-A/99, item b3", 39: "#39 Over 23 years old", 42: "#42 Transfer", 43: "#43 Change of course", 44: "#44 Technological specialization diploma holders",
+    51: "#51 Change of institution/course", 53: "#53 Short cycle diploma holders", 57: "#57 Change of institution/course (International)"
+}
+
+course_dict = {
+    33: "#33 Biofuel Production Technologies",
+    171: "#171 Animation and Multimedia Design",
+    8014: "#8014 Social Service (evening attendance)",
+    9003: "#9003 Agronomy",
+    9070: "#9070 Communication Design",
+    9085: "#9085 Veterinary Nursing",
+    9119: "#9119 Informatics Engineering",
+    9130: "#9130 Equinculture",
+    9147: "#9147 Management",
+    9238: "#9238 Social Service",
+    9254: "#9254 Tourism",
+    9500: "#9500 Nursing",
+    9556: "#9556 Oral Hygiene",
+    9670: "#9670 Advertising and Marketing Management",
+    9773: "#9773 Journalism and Communication",
+    9853: "#9853 Basic Education",
+    9991: "#9991 Management (evening attendance)"
+}
+
+previous_qualification_dict = {
+    1: "#1 Secondary education",
+    2: "#2 Higher education - bachelor's degree",
+    3: "#3 Higher education - degree",
+    4: "#4 Higher education - master's",
+    5: "#5 Higher education - doctorate",
+    6: "#6 Frequency of higher education",
+    9: "#9 12th year of schooling - not completed",
+    10: "#10 11th year of schooling - not completed",
+    12: "#12 Other 11th year of schooling",
+    14: "#14 10th year of schooling",
+    15: "#15 10th year of schooling - not completed",
+    19: "#19 Basic education 3rd cycle (9th/10th/11th year) or equiv.",
+    38: "#38 Basic education 2nd cycle (6th/7th/8th year) or equiv.",
+    39: "#39 Technological specialization course",
+    40: "#40 Higher education - degree (1st cycle)",
+    42: "#42 Professional higher technical course",
+    43: "#43 Higher education - master (2nd cycle)"
+}
+
+nacionality_dict = {
+    1: "#1 Portuguese",
+    2: "#2 German",
+    6: "#6 Spanish",
+    11: "#11 Italian",
+    13: "#13 Dutch",
+    14: "#14 English",
+    17: "#17 Lithuanian",
+    21: "#21 Angolan",
+    22: "#22 Cape Verdean",
+    24: "#24 Guinean",
+    25: "#25 Mozambican",
+    26: "#26 Santomean",
+    32: "#32 Turkish",
+    41: "#41 Brazilian",
+    62: "#62 Romanian",
+    100: "#100 Moldova (Republic of)",
+    101: "#101 Mexican",
+    103: "#103 Ukrainian",
+    105: "#105 Russian",
+    108: "#108 Cuban",
+    109: "#109 Colombian"
+}
+
+parent_qualification_dict = {
+    1: "#1 Secondary Education - 12th Year of Schooling or Eq.",
+    2: "#2 Higher Education - Bachelor's Degree",
+    3: "#3 Higher Education - Degree",
+    4: "#4 Higher Education - Master's",
+    5: "#5 Higher Education - Doctorate",
+    6: "#6 Frequency of Higher Education",
+    9: "#9 12th Year of Schooling - Not Completed",
+    10: "#10 11th Year of Schooling - Not Completed",
+    11: "#11 7th Year (Old)",
+    12: "#12 Other - 11th Year of Schooling",
+    14: "#14 10th Year of Schooling",
+    18: "#18 General commerce course",
+    19: "#19 Basic Education 3rd Cycle (9th/10th/11th Year) or Equiv.",
+    22: "#22 Technical-professional course",
+    26: "#26 7th year of schooling",
+    27: "#27 2nd cycle of the general high school course",
+    29: "#29 9th Year of Schooling - Not Completed",
+    30: "#30 8th year of schooling",
+    34: "#34 Unknown",
+    35: "#35 Can't read or write",
+    36: "#36 Can read without having a 4th year of schooling",
+    37: "#37 Basic education 1st cycle (4th/5th year) or equiv.",
+    38: "#38 Basic Education 2nd Cycle (6th/7th/8th Year) or Equiv.",
+    39: "#39 Technological specialization course",
+    40: "#40 Higher education - degree (1st cycle)",
+    41: "#41 Specialized higher studies course",
+    42: "#42 Professional higher technical course",
+    43: "#43 Higher Education - Master (2nd cycle)",
+    44: "#44 Higher Education - Doctorate (3rd cycle)"
+}
+
+parent_occupation_dict = {
+    0: "#0 Student",
+    1: "#1 Representatives of the Legislative Power and Executive Bodies, Directors, Directors and Executive Managers",
+    2: "#2 Specialists in Intellectual and Scientific Activities",
+    3: "#3 Intermediate Level Technicians and Professions",
+    4: "#4 Administrative staff",
+    5: "#5 Personal Services, Security and Safety Workers and Sellers",
+    6: "#6 Farmers and Skilled Workers in Agriculture, Fisheries and Forestry",
+    7: "#7 Skilled Workers in Industry, Construction and Craftsmen",
+    8: "#8 Installation and Machine Operators and Assembly Workers",
+    9: "#9 Unskilled Workers",
+    10: "#10 Armed Forces Professions",
+    90: "#90 Other Situation",
+    99: "#99 (blank)",
+    122: "#122 Health professionals",
+    123: "#123 Teachers",
+    125: "#125 Specialists in information and communication technologies (ICT)",
+    131: "#131 Intermediate level science and engineering technicians and professions",
+    132: "#132 Technicians and professionals, of intermediate level of health",
+    134: "#134 Intermediate level technicians from legal, social, sports, cultural and similar services",
+    141: "#140 Office workers, secretaries in general and data processing operators",
+    143: "#143 Data, accounting, statistical, financial services and registry-related operators",
+    144: "#144 Other administrative support staff",
+    151: "#151 Personal service workers",
+    152: "#152 Sellers",
+    153: "#153 Personal care workers and the like",
+    171: "#171 Skilled construction workers and the like, except electricians",
+    173: "#173 Skilled workers in printing, precision instrument manufacturing, jewelers, artisans and the like",
+    175: "#175 Workers in food processing, woodworking, clothing and other industries and crafts",
+    191: "#191 Cleaning workers",
+    192: "#192 Unskilled workers in agriculture, animal production, fisheries and forestry",
+    193: "#193 Unskilled workers in extractive industry, construction, manufacturing and transport",
+    194: "#194 Meal preparation assistants"
+}
@@ -0,0 +1,141 @@
+import argparse
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+from batch_score import DEFAULT_CHUNK_SIZE, ResultWriter, check_columns, iter_shards
+from prediction_cache import model_signature
+from preprocessing import build_feature_frame
+from scoring import ENGINES, MODEL_PATH, label_predictions, load_model, predict_with_proba
+
+DEFAULT_STORE_PATH = "score_store.npz"
+STORE_VERSION = 1
+
+# Store menyimpan, per mahasiswa, hash vektor fitur yang sudah di-encode
+# beserta prediksi terakhirnya. Baris yang hash-nya sama dengan snapshot
+# sebelumnya tidak diprediksi ulang. Store dianggap kosong bila signature
+# model berbeda dengan saat store ditulis.
+
+
+class ScoreStore:
+    def __init__(self, ids, hashes, predictions, probabilities, signature=None):
+        self.ids = ids
+        self.hashes = hashes
+        self.predictions = predictions
+        self.probabilities = probabilities
+        self.signature = signature
+        self._index = pd.Index(ids)
+
+    @classmethod
+    def empty(cls, signature=None):
+        return cls(np.array([], dtype=str), np.array([], dtype=np.uint64), np.array([], dtype=np.int8), np.array([], dtype=np.float32), signature)
+
+    @classmethod
+    def load(cls, path, signature):
+        if not os.path.exists(path):
+            return cls.empty(signature)
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(str(data['meta']))
+            if meta.get('version') != STORE_VERSION or meta.get('signature') != list(signature):
+                return cls.empty(signature)
+            return cls(data['ids'], data['hashes'], data['predictions'], data['probabilities'], signature)
+
+    def save(self, path):
+        meta = json.dumps({'version': STORE_VERSION, 'signature': list(self.signature)})
+        tmp = f"{path}.tmp.npz"
+        np.savez(tmp, ids=self.ids, hashes=self.hashes, predictions=self.predictions, probabilities=self.probabilities, meta=np.array(meta))
+        os.replace(tmp, path)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def lookup(self, ids):
+        # Posisi tiap id di store, -1 untuk id yang belum pernah diprediksi
+        return self._index.get_indexer(ids)
+
+
+def hash_features(X):
+    return pd.util.hash_pandas_object(X.astype(np.float32), index=False).to_numpy()
+
+
+def rescore_chunk(model, feature_names, chunk, id_column, store):
+    X = build_feature_frame(chunk, feature_names)
+    ids = chunk[id_column].astype(str).to_numpy(dtype=str)
+    hashes = hash_features(X)
+
+    positions = store.lookup(ids)
+    known = positions >= 0
+    changed = ~known
+    changed[known] = store.hashes[positions[known]] != hashes[known]
+
+    predictions = np.zeros(len(chunk), dtype=np.int8)
+    probabilities = np.zeros(len(chunk), dtype=np.float32)
+    unchanged = ~changed
+    predictions[unchanged] = store.predictions[positions[unchanged]]
+    probabilities[unchanged] = store.probabilities[positions[unchanged]]
+    if changed.any():
+        new_predictions, new_probabilities = predict_with_proba(model, X[changed])
+        predictions[changed] = new_predictions
+        probabilities[changed] = new_probabilities
+
+    result = label_predictions(chunk, predictions, probabilities)
+    result['Rescored'] = changed
+    return result, (ids, hashes, predictions, probabilities)
+
+
+def run(input_path, output_path, id_column, store_path=DEFAULT_STORE_PATH, model_path=MODEL_PATH, chunk_size=DEFAULT_CHUNK_SIZE, engine='sklearn'):
+    signature = model_signature(model_path)
+    model, feature_names = load_model(model_path, engine)
+    store = ScoreStore.load(store_path, signature)
+
+    writer = ResultWriter(output_path)
+    parts = []
+    rescored = 0
+    try:
+        for chunk in iter_shards(input_path, chunk_size):
+            if id_column not in chunk.columns:
+                raise ValueError(f"Kolom id tidak ditemukan: {id_column}")
+            result, part = rescore_chunk(model, feature_names, check_columns(chunk), id_column, store)
+            writer.write(result)
+            parts.append(part)
+            rescored += int(result['Rescored'].sum())
+    finally:
+        writer.close()
+
+    # Store baru hanya berisi mahasiswa yang ada di snapshot ini
+    if parts:
+        ids, hashes, predictions, probabilities = (np.concatenate(arrays) for arrays in zip(*parts))
+        # id ganda dalam snapshot: yang terakhir dipakai, agar id di store unik
+        _, last = np.unique(ids[::-1], return_index=True)
+        keep = np.sort(len(ids) - 1 - last)
+        ScoreStore(ids[keep], hashes[keep], predictions[keep], probabilities[keep], signature).save(store_path)
+    else:
+        ScoreStore.empty(signature).save(store_path)
+    return writer.rows, rescored
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Prediksi ulang hanya mahasiswa yang baru atau datanya berubah.")
+    parser.add_argument("input", help="Snapshot mahasiswa (CSV atau Parquet)")
+    parser.add_argument("output", help="File output CSV atau Parquet berisi hasil gabungan")
+    parser.add_argument("--id-column", required=True, help="Kolom identitas mahasiswa")
+    parser.add_argument("--store", default=DEFAULT_STORE_PATH, help="File store hasil sebelumnya (default: %(default)s)")
+    parser.add_argument("--model", default=MODEL_PATH, help="Path artefak model (default: %(default)s)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Jumlah baris per chunk (default: %(default)s)")
+    parser.add_argument("--engine", choices=ENGINES, default='sklearn', help="Engine inferensi (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    try:
+        rows, rescored = run(args.input, args.output, args.id_column, args.store, args.model, args.chunk_size, args.engine)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 1
+    print(f"{rows} baris, {rescored} diprediksi ulang, {rows - rescored} dari store -> {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,211 @@
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from batch_score import check_columns, is_parquet, iter_shards
+from drift import drift_scores
+from metrics import MetricsRegistry
+from prediction_cache import model_signature
+from preprocessing import build_feature_frame
+from scoring import load_model, score_features
+
+DEFAULT_CHUNK_SIZE = 5000
+DEFAULT_WORKERS = 2
+STATE_NAME = "job.json"
+RESULT_NAME = "result.csv"
+
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+# Setiap job punya direktori sendiri berisi file input, job.json dan hasil
+# per chunk (part-00000.csv, ...). job.json baru diperbarui setelah file
+# part ditulis, sehingga setelah crash atau restart job dilanjutkan dari
+# chunk terakhir yang selesai; part yang setengah jadi akan ditimpa.
+
+
+def write_json_atomic(path, data):
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp, path)
+
+
+def read_header(path):
+    if is_parquet(path):
+        import pyarrow.parquet as pq
+
+        return pq.read_schema(path).empty_table().to_pandas()
+    return pd.read_csv(path, nrows=0)
+
+
+def count_rows(path):
+    if is_parquet(path):
+        import pyarrow.parquet as pq
+
+        return pq.ParquetFile(path).metadata.num_rows
+    with open(path, "rb") as f:
+        return max(sum(1 for _ in f) - 1, 0)
+
+
+class JobManager:
+    def __init__(self, jobs_dir, model_path, engine='sklearn', workers=DEFAULT_WORKERS, chunk_size=DEFAULT_CHUNK_SIZE, metrics=None, registry=None, drift_reference=None):
+        self.jobs_dir = jobs_dir
+        self.model_path = model_path
+        self.registry = registry
+        self.drift_reference = drift_reference
+        self.engine = engine
+        self.chunk_size = chunk_size
+        self.metrics = metrics or MetricsRegistry(enabled=False)
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="scoring-job")
+        self._lock = threading.Lock()
+        self._model = None
+        self._signature = None
+        os.makedirs(jobs_dir, exist_ok=True)
+        self._resume()
+
+    def _job_dir(self, job_id):
+        return os.path.join(self.jobs_dir, job_id)
+
+    def _save(self, state):
+        write_json_atomic(os.path.join(self._job_dir(state['id']), STATE_NAME), state)
+
+    def status(self, job_id):
+        with open(os.path.join(self._job_dir(job_id), STATE_NAME)) as f:
+            state = json.load(f)
+        state['throughput'] = state['rows_done'] / state['elapsed'] if state['elapsed'] else 0.0
+        return state
+
+    def list_jobs(self):
+        job_ids = [
+            name for name in os.listdir(self.jobs_dir)
+            if os.path.isfile(os.path.join(self._job_dir(name), STATE_NAME))
+        ]
+        return [self.status(job_id) for job_id in sorted(job_ids)]
+
+    def drift_report(self, job_id):
+        state = self.status(job_id)
+        if self.drift_reference is None or not state.get('drift') or not state['drift']['rows']:
+            return None
+        current = self.drift_reference.empty_like().merge(state['drift']['counts'], state['drift']['rows'])
+        return drift_scores(self.drift_reference, current)
+
+    def result_path(self, job_id):
+        return os.path.join(self._job_dir(job_id), RESULT_NAME)
+
+    def submit(self, name, data, explain_features=False):
+        job_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        job_dir = self._job_dir(job_id)
+        os.makedirs(job_dir)
+        input_path = os.path.join(job_dir, "input.parquet" if is_parquet(name) else "input.csv")
+        with open(input_path, "wb") as f:
+            f.write(data)
+
+        try:
+            # Cek header lebih dulu supaya file yang salah langsung ditolak
+            check_columns(read_header(input_path))
+        except Exception:
+            shutil.rmtree(job_dir, ignore_errors=True)
+            raise
+
+        state = {
+            'id': job_id,
+            'name': name,
+            'input': input_path,
+            'status': QUEUED,
+            'explain': explain_features,
+            'chunk_size': self.chunk_size,
+            'total_rows': count_rows(input_path),
+            'chunks_done': 0,
+            'rows_done': 0,
+            'dropouts': 0,
+            'elapsed': 0.0,
+            'created': time.time(),
+            'finished': None,
+            'error': None,
+        }
+        self._save(state)
+        self._executor.submit(self._run, job_id)
+        return job_id
+
+    def _resume(self):
+        for state in self.list_jobs():
+            if state['status'] in (QUEUED, RUNNING):
+                self._executor.submit(self._run, state['id'])
+
+    def _get_model(self):
+        # Dengan registry, job memakai versi yang aktif saat job dimulai;
+        # tanpa registry model dimuat ulang jika file model berubah
+        if self.registry is not None:
+            active = self.registry.active
+            return active.model, active.feature_names
+        with self._lock:
+            signature = model_signature(self.model_path)
+            if signature != self._signature:
+                self._model = load_model(self.model_path, self.engine)
+                self._signature = signature
+            return self._model
+
+    def _part_path(self, job_id, index):
+        return os.path.join(self._job_dir(job_id), f"part-{index:05d}.csv")
+
+    def _run(self, job_id):
+        state = self.status(job_id)
+        state['status'] = RUNNING
+        self._save(state)
+        try:
+            model, feature_names = self._get_model()
+            drift = None
+            if self.drift_reference is not None:
+                # Counter drift disimpan di job.json agar ikut dilanjutkan
+                drift = self.drift_reference.empty_like()
+                if state.get('drift'):
+                    drift.merge(state['drift']['counts'], state['drift']['rows'])
+
+            for index, chunk in enumerate(iter_shards(state['input'], state['chunk_size'])):
+                if index < state['chunks_done']:
+                    continue
+                start = time.perf_counter()
+                with self.metrics.timer("job_chunk"):
+                    X = build_feature_frame(check_columns(chunk), feature_names)
+                    result = score_features(model, feature_names, chunk, X, state['explain'])
+                    if drift is not None:
+                        drift.update(X)
+                part = self._part_path(job_id, index)
+                result.to_csv(f"{part}.tmp", index=False)
+                os.replace(f"{part}.tmp", part)
+
+                state['chunks_done'] = index + 1
+                state['rows_done'] += len(chunk)
+                state['dropouts'] += int((result['Prediction'] == 1).sum())
+                state['elapsed'] += time.perf_counter() - start
+                if drift is not None:
+                    state['drift'] = {'rows': drift.rows, 'counts': {column: counts.tolist() for column, counts in drift.counts.items()}}
+                self._save(state)
+                self.metrics.count("rows", len(chunk), mode="job")
+
+            self._merge_parts(job_id, state['chunks_done'])
+            state['status'] = DONE
+            state['finished'] = time.time()
+        except Exception as e:
+            state['status'] = FAILED
+            state['error'] = str(e)
+        self._save(state)
+
+    def _merge_parts(self, job_id, n_parts):
+        path = self.result_path(job_id)
+        with open(f"{path}.tmp", "wb") as out:
+            for index in range(n_parts):
+                with open(self._part_path(job_id, index), "rb") as part:
+                    header = part.readline()
+                    if index == 0:
+                        out.write(header)
+                    shutil.copyfileobj(part, out)
+        os.replace(f"{path}.tmp", path)
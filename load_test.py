@@ -0,0 +1,62 @@
+import argparse
+import json
+import threading
+import time
+import urllib.request
+
+import pandas as pd
+
+
+def post(url, payload):
+    request = urllib.request.Request(url, data=json.dumps(payload).encode("utf-8"), headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(request) as response:
+        return json.loads(response.read())
+
+
+def run(url, records, concurrency, requests_per_client):
+    latencies = []
+    errors = []
+    lock = threading.Lock()
+
+    def client(offset):
+        for i in range(requests_per_client):
+            record = records[(offset * requests_per_client + i) % len(records)]
+            start = time.perf_counter()
+            try:
+                post(url, record)
+            except Exception as e:
+                with lock:
+                    errors.append(e)
+                continue
+            with lock:
+                latencies.append(time.perf_counter() - start)
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(concurrency)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return latencies, errors, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generator beban lokal untuk serve.py.")
+    parser.add_argument("input", help="File CSV berisi data mahasiswa mentah sebagai isi request")
+    parser.add_argument("--url", default="http://127.0.0.1:8000/predict")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=100, help="Jumlah request per klien (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    records = json.loads(pd.read_csv(args.input).to_json(orient="records"))
+    latencies, errors, elapsed = run(args.url, records, args.concurrency, args.requests)
+    if latencies:
+        ms = pd.Series(latencies) * 1000
+        print(f"{len(latencies)} request dalam {elapsed:.2f} dtk ({len(latencies) / elapsed:.0f} req/dtk), {len(errors)} gagal")
+        print(f"latensi ms: p50={ms.quantile(0.5):.1f} p95={ms.quantile(0.95):.1f} p99={ms.quantile(0.99):.1f} max={ms.max():.1f}")
+    else:
+        print(f"Semua {len(errors)} request gagal: {errors[0] if errors else '-'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+import bisect
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+DEFAULT_WINDOW = 1024
+
+
+class LatencyHistogram:
+    # Histogram kumulatif ala Prometheus ditambah jendela sampel terakhir
+    # untuk persentil bergulir
+
+    def __init__(self, buckets=DEFAULT_BUCKETS, window=DEFAULT_WINDOW):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+        self.recent = deque(maxlen=window)
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.total += seconds
+        self.count += 1
+        self.recent.append(seconds)
+
+    def percentile(self, q):
+        if not self.recent:
+            return 0.0
+        ordered = sorted(self.recent)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class _Timer:
+    __slots__ = ('registry', 'stage', 'start')
+
+    def __init__(self, registry, stage):
+        self.registry = registry
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.registry.observe(self.stage, (time.perf_counter_ns() - self.start) / 1e9)
+        return False
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+NULL_TIMER = _NullTimer()
+
+
+class MetricsRegistry:
+    # Saat disabled, timer() mengembalikan NULL_TIMER bersama dan count()
+    # langsung kembali, sehingga biaya instrumentasi hampir nol
+
+    def __init__(self, enabled=True, namespace="dropout"):
+        self.enabled = enabled
+        self.namespace = namespace
+        self.stages = {}
+        self.counters = {}
+        self._lock = threading.Lock()
+
+    def timer(self, stage):
+        if not self.enabled:
+            return NULL_TIMER
+        return _Timer(self, stage)
+
+    def observe(self, stage, seconds):
+        with self._lock:
+            histogram = self.stages.get(stage)
+            if histogram is None:
+                histogram = self.stages[stage] = LatencyHistogram()
+            histogram.observe(seconds)
+
+    def count(self, name, value=1, **labels):
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def summary(self):
+        with self._lock:
+            return [
+                {
+                    'stage': stage,
+                    'count': h.count,
+                    'mean_ms': h.total / h.count * 1e3 if h.count else 0.0,
+                    'p50_ms': h.percentile(0.50) * 1e3,
+                    'p95_ms': h.percentile(0.95) * 1e3,
+                    'p99_ms': h.percentile(0.99) * 1e3,
+                }
+                for stage, h in self.stages.items()
+            ]
+
+    def prometheus_text(self):
+        name = f"{self.namespace}_stage_latency_seconds"
+        lines = [
+            f"# HELP {name} Latensi per tahap prediksi.",
+            f"# TYPE {name} histogram",
+        ]
+        with self._lock:
+            for stage, h in self.stages.items():
+                cumulative = 0
+                for bound, count in zip(h.buckets, h.counts):
+                    cumulative += count
+                    lines.append(f'{name}_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+                lines.append(f'{name}_bucket{{stage="{stage}",le="+Inf"}} {h.count}')
+                lines.append(f'{name}_sum{{stage="{stage}"}} {h.total}')
+                lines.append(f'{name}_count{{stage="{stage}"}} {h.count}')
+
+            declared = set()
+            for (counter, labels), value in sorted(self.counters.items()):
+                full_name = f"{self.namespace}_{counter}_total"
+                if full_name not in declared:
+                    lines.append(f"# TYPE {full_name} counter")
+                    declared.add(full_name)
+                label_text = ",".join(f'{k}="{v}"' for k, v in labels)
+                lines.append(f"{full_name}{{{label_text}}} {value}" if label_text else f"{full_name} {value}")
+        return "\n".join(lines) + "\n"
+
+
+def start_http_server(registry, port, host="0.0.0.0"):
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path != "/metrics":
+                self.send_response(404)
+                self.end_headers()
+                return
+            body = registry.prometheus_text().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
@@ -0,0 +1,115 @@
+import argparse
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+from forest_engine import CompiledForest, compile_forest
+
+FORMAT_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+ARRAY_NAMES = ('feature', 'threshold', 'left', 'right', 'missing_left', 'value', 'roots', 'classes')
+
+# Artefak berupa direktori berisi satu file .npy tak terkompresi per array
+# forest plus manifest.json. File .npy dibuka dengan mmap sehingga beberapa
+# proses berbagi halaman memori fisik yang sama dan start-up tidak perlu
+# unpickle seluruh forest.
+
+
+def save_artifact(forest, feature_names, directory):
+    parent = os.path.dirname(os.path.abspath(directory))
+    staging = tempfile.mkdtemp(prefix=".artifact-", dir=parent)
+    try:
+        arrays = {}
+        for name in ARRAY_NAMES:
+            array = np.ascontiguousarray(getattr(forest, 'classes_' if name == 'classes' else name))
+            np.save(os.path.join(staging, f"{name}.npy"), array, allow_pickle=False)
+            arrays[name] = {'dtype': array.dtype.str, 'shape': list(array.shape)}
+
+        manifest = {
+            'format_version': FORMAT_VERSION,
+            'feature_names': list(feature_names),
+            'n_features': int(forest.n_features_in_),
+            'max_depth': int(forest.max_depth),
+            'n_trees': int(forest.n_trees),
+            'arrays': arrays,
+        }
+        with open(os.path.join(staging, MANIFEST_NAME), "w") as f:
+            json.dump(manifest, f, indent=2)
+
+        # Direktori lama disingkirkan dengan rename lalu staging di-rename ke
+        # tempatnya, baru direktori lama dihapus. Pembaca tidak pernah melihat
+        # artefak setengah jadi dan jeda tanpa artefak hanya selama dua rename
+        # (bukan selama rmtree seluruh isi direktori).
+        previous = None
+        if os.path.exists(directory):
+            previous = f"{staging}-old"
+            os.rename(directory, previous)
+        try:
+            os.rename(staging, directory)
+        except BaseException:
+            if previous is not None:
+                os.rename(previous, directory)
+            raise
+        if previous is not None:
+            shutil.rmtree(previous, ignore_errors=True)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+
+def load_artifact(directory, mmap=True):
+    with open(os.path.join(directory, MANIFEST_NAME)) as f:
+        manifest = json.load(f)
+    if manifest.get('format_version') != FORMAT_VERSION:
+        raise ValueError(f"Versi format artefak tidak didukung: {manifest.get('format_version')}")
+
+    arrays = {}
+    for name, spec in manifest['arrays'].items():
+        array = np.load(os.path.join(directory, f"{name}.npy"), mmap_mode='r' if mmap else None, allow_pickle=False)
+        if array.dtype.str != spec['dtype'] or list(array.shape) != spec['shape']:
+            raise ValueError(f"Array {name} tidak sesuai dengan manifest")
+        arrays[name] = array
+
+    forest = CompiledForest(
+        feature=arrays['feature'],
+        threshold=arrays['threshold'],
+        left=arrays['left'],
+        right=arrays['right'],
+        missing_left=arrays['missing_left'],
+        value=arrays['value'],
+        roots=np.array(arrays['roots']),
+        max_depth=manifest['max_depth'],
+        classes=np.array(arrays['classes']),
+        n_features=manifest['n_features'],
+    )
+    return forest, manifest['feature_names']
+
+
+def is_artifact(path):
+    return os.path.isfile(os.path.join(path, MANIFEST_NAME))
+
+
+def convert(pickle_path, directory):
+    from scoring import load_model
+
+    model, feature_names = load_model(pickle_path)
+    forest = compile_forest(model)
+    save_artifact(forest, feature_names, directory)
+    return forest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Konversi rf_model.pkl ke artefak .npy yang bisa di-mmap.")
+    parser.add_argument("model", help="Path rf_model.pkl")
+    parser.add_argument("output", help="Direktori artefak tujuan")
+    args = parser.parse_args(argv)
+
+    forest = convert(args.model, args.output)
+    print(f"{forest.n_trees} pohon, {len(forest.feature)} node -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
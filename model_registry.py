@@ -0,0 +1,193 @@
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from model_artifact import is_artifact
+from preprocessing import build_feature_frame
+from prediction_cache import model_signature
+from scoring import as_compiled, assemble_features, load_model, model_input, predict_with_proba
+from synthetic_data import generate_students
+
+DEFAULT_POLL_INTERVAL = 5.0
+DEFAULT_WARMUP_ROWS = 64
+MAX_SHADOW_PENDING = 100
+
+
+def version_key(name):
+    # Urutan natural: rf_model-10 lebih baru dari rf_model-9
+    return [(0, int(part), '') if part.isdigit() else (1, 0, part) for part in re.split(r'(\d+)', name)]
+
+
+class ModelVersion:
+    def __init__(self, version, path, model, feature_names, signature):
+        self.version = version
+        self.path = path
+        self.model = model
+        self.feature_names = feature_names
+        self.signature = signature
+        self.loaded_at = time.time()
+
+
+class ShadowStats:
+    def __init__(self):
+        self.count = 0
+        self.disagreements = 0
+        self.abs_diff_sum = 0.0
+        self.dropped = 0
+
+    def as_dict(self):
+        return {
+            'count': self.count,
+            'disagreements': self.disagreements,
+            'agreement': 1 - self.disagreements / self.count if self.count else None,
+            'mean_abs_probability_diff': self.abs_diff_sum / self.count if self.count else None,
+            'dropped': self.dropped,
+        }
+
+
+class ModelRegistry:
+    # Memantau direktori berisi artefak berversi (rf_model-<versi>.pkl atau
+    # direktori artefak mmap). Versi baru dimuat dan dipanaskan di thread
+    # latar belakang lalu ditukar dengan satu assignment referensi, jadi
+    # request yang sedang berjalan tetap memakai versi lama sampai selesai.
+    # Dengan shadow=True versi baru menjadi kandidat: ikut memprediksi
+    # traffic live di latar belakang dan baru aktif setelah promote().
+
+    def __init__(self, model_dir, engine='sklearn', poll_interval=DEFAULT_POLL_INTERVAL, shadow=False, warmup_rows=DEFAULT_WARMUP_ROWS):
+        self.model_dir = model_dir
+        self.engine = engine
+        self.poll_interval = poll_interval
+        self.shadow = shadow
+        self.warmup_rows = warmup_rows
+        self.active = None
+        self.candidate = None
+        self.shadow_stats = ShadowStats()
+        self.errors = {}
+        self._lock = threading.Lock()
+        self._shadow_pending = 0
+        self._shadow_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="shadow-scoring")
+        self._stop = threading.Event()
+
+        # Versi terbaru yang bisa dimuat menjadi model aktif awal
+        for version, path in sorted(self._versions(), key=lambda item: version_key(item[0]), reverse=True):
+            try:
+                self.active = self._load(version, path)
+                break
+            except Exception as e:
+                self.errors[version] = (model_signature(path), str(e))
+        if self.active is None:
+            raise FileNotFoundError(f"Tidak ada artefak model yang bisa dimuat di {model_dir}")
+
+        self._thread = threading.Thread(target=self._watch, name="model-registry", daemon=True)
+        self._thread.start()
+
+    def _versions(self):
+        for name in os.listdir(self.model_dir):
+            path = os.path.join(self.model_dir, name)
+            if name.endswith(".pkl") and os.path.isfile(path):
+                yield name[:-len(".pkl")], path
+            elif is_artifact(path):
+                yield name, path
+
+    def _latest(self):
+        versions = sorted(self._versions(), key=lambda item: version_key(item[0]))
+        return versions[-1] if versions else None
+
+    def _load(self, version, path):
+        signature = model_signature(path)
+        model, feature_names = load_model(path, self.engine)
+        self._warm_up(model, feature_names)
+        return ModelVersion(version, path, model, feature_names, signature)
+
+    def _warm_up(self, model, feature_names):
+        # Menjalankan jalur batch, jalur satu baris dan kompilasi untuk
+        # kontribusi fitur supaya request pertama tidak membayar biaya awal
+        students = generate_students(self.warmup_rows, seed=0)
+        predict_with_proba(model, build_feature_frame(students, feature_names))
+        for raw in students.head(3).to_dict('records'):
+            predict_with_proba(model, model_input(model, feature_names, assemble_features(raw)))
+        as_compiled(model)
+
+    def _is_known(self, version, path):
+        for current in (self.active, self.candidate):
+            if current is not None and current.version == version and current.signature == model_signature(path):
+                return True
+        return self.errors.get(version, (None,))[0] == model_signature(path)
+
+    def check(self):
+        latest = self._latest()
+        if latest is None:
+            return False
+        version, path = latest
+        if self._is_known(version, path) or version_key(version) < version_key(self.active.version):
+            return False
+        try:
+            loaded = self._load(version, path)
+        except Exception as e:
+            self.errors[version] = (model_signature(path), str(e))
+            return False
+
+        with self._lock:
+            if self.shadow:
+                self.candidate = loaded
+                self.shadow_stats = ShadowStats()
+            else:
+                self.active = loaded
+        return True
+
+    def _watch(self):
+        while not self._stop.wait(self.poll_interval):
+            try:
+                self.check()
+            except OSError:
+                pass
+
+    def promote(self):
+        with self._lock:
+            if self.candidate is None:
+                return False
+            self.active, self.candidate = self.candidate, None
+            self.shadow_stats = ShadowStats()
+            return True
+
+    def observe(self, features, prediction, probability):
+        # Dipanggil setelah prediksi live; kandidat dinilai di thread lain
+        # agar tidak menambah latensi request
+        candidate = self.candidate
+        if candidate is None:
+            return
+        with self._lock:
+            if self._shadow_pending >= MAX_SHADOW_PENDING:
+                self.shadow_stats.dropped += 1
+                return
+            self._shadow_pending += 1
+        self._shadow_executor.submit(self._shadow_score, candidate, self.shadow_stats, features, prediction, probability)
+
+    def _shadow_score(self, candidate, stats, features, prediction, probability):
+        try:
+            predictions, probabilities = predict_with_proba(
+                candidate.model, model_input(candidate.model, candidate.feature_names, features)
+            )
+            with self._lock:
+                stats.count += 1
+                stats.disagreements += int(predictions[0] != prediction)
+                stats.abs_diff_sum += abs(float(probabilities[0]) - probability)
+        finally:
+            with self._lock:
+                self._shadow_pending -= 1
+
+    def status(self):
+        return {
+            'active': self.active.version,
+            'active_loaded_at': self.active.loaded_at,
+            'candidate': self.candidate.version if self.candidate else None,
+            'shadow': self.shadow_stats.as_dict() if self.candidate else None,
+            'errors': {version: error for version, (_, error) in self.errors.items()},
+        }
+
+    def close(self):
+        self._stop.set()
+        self._thread.join()
+        self._shadow_executor.shutdown()
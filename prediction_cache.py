@@ -0,0 +1,88 @@
+import os
+import threading
+from collections import OrderedDict
+
+from metrics import MetricsRegistry
+from model_artifact import MANIFEST_NAME, is_artifact
+
+DEFAULT_MAXSIZE = 4096
+
+
+def model_signature(path):
+    # Berubah setiap kali file model ditimpa; untuk artefak direktori yang
+    # dicek adalah manifest-nya karena ditulis ulang di setiap konversi
+    if is_artifact(path):
+        path = os.path.join(path, MANIFEST_NAME)
+    stat = os.stat(path)
+    return (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+
+
+class PredictionCache:
+    # LRU terbatas untuk prediksi satu baris, dengan kunci tuple fitur yang
+    # sudah di-encode dan diurutkan sesuai feature_names. Aman dipakai
+    # bersama oleh banyak sesi Streamlit.
+
+    def __init__(self, maxsize=DEFAULT_MAXSIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': len(self._data),
+            'maxsize': self.maxsize,
+            'hit_rate': self.hits / total if total else 0.0,
+        }
+
+
+NULL_METRICS = MetricsRegistry(enabled=False)
+
+
+def cached_predict(cache, model, feature_names, features, metrics=NULL_METRICS):
+    # Mengembalikan (prediksi, probabilitas dropout, kontribusi per fitur).
+    # Kontribusi ikut disimpan di cache agar cache hit tidak menelusuri forest
+    from scoring import explain, model_input, predict_with_proba
+
+    key = tuple(features[name] for name in feature_names)
+    result = cache.get(key)
+    metrics.count("prediction_cache_lookups", result="miss" if result is None else "hit")
+    if result is None:
+        with metrics.timer("assemble"):
+            X = model_input(model, feature_names, features)
+        with metrics.timer("predict"):
+            predictions, probabilities = predict_with_proba(model, X)
+        with metrics.timer("explain"):
+            _, values = explain(model, X)
+        result = (predictions[0], float(probabilities[0]), values[0])
+        cache.put(key, result)
+    return result
@@ -0,0 +1,345 @@
+import numpy as np
+import pandas as pd
+
+
+# Mapping kategori dan aturan pengelompokan dibuat sekali per proses,
+# bukan setiap kali preprocess_input_raw dipanggil
+edu_map = {'Basic': 0, 'Secondary': 1, 'Higher': 2, 'Other': 3}
+grade_map = {'Very Low': 0, 'Low': 1, 'High': 2, 'Very High': 3}
+age_map = {'<18': 0, '18-21': 1, '22-25': 2, '>25': 3}
+binary_map = {'Local': 0, 'Foreign': 1, 'Officer': 0, 'Labor': 1, 'Other': 2}
+course_map = {
+    'Engineering/Tech': 0, 'Arts/Design': 1, 'Health': 2,
+    'Social Sciences': 3, 'Business': 4, 'Other': 5
+}
+app_mode_map = {
+    'Regular': 0, 'Special': 1, 'International': 2,
+    'Transfer': 3, 'Other': 4, 'Unknown': 5
+}
+
+OFFICER_OCCUPATIONS = frozenset({1, 2, 3, 4, 112, 114, 121, 122, 123, 124, 131, 132, 134, 135, 141, 143, 144})
+LABOR_OCCUPATIONS = frozenset({5, 6, 7, 8, 9, 10, 151, 152, 153, 154, 161, 163, 171, 172, 174, 175, 181, 182, 183, 191, 192, 193, 194, 195})
+
+
+def simplify_application_mode(mode):
+    if mode in (1, 17, 18):
+        return 'Regular'
+    elif mode in (2, 5, 10, 16):
+        return 'Special'
+    elif mode in (15, 57):
+        return 'International'
+    elif mode in (42, 43, 51, 53):
+        return 'Transfer'
+    elif mode in (26, 27, 39, 44):
+        return 'Other'
+    return 'Unknown'
+
+
+def simplify_edu(code):
+    if code in (19, 37, 38, 35, 36):
+        return 'Basic'
+    elif code in (1, 9, 10, 12, 14, 15, 22, 26, 27, 29, 30):
+        return 'Secondary'
+    elif code in (2, 3, 4, 5, 6, 40, 41, 42, 43, 44):
+        return 'Higher'
+    return 'Other'
+
+
+def simplify_nacionality(code):
+    return 'Local' if code == 1 else 'Foreign'
+
+
+def simplify_admission_grade(g):
+    if g <= 117.9:
+        return 'Very Low'
+    elif g <= 126.1:
+        return 'Low'
+    elif g <= 134.8:
+        return 'High'
+    else:
+        return 'Very High'
+
+
+def simplify_sem1_grade(val):
+    if val <= 11.0:
+        return 'Very Low'
+    elif val <= 12.29:
+        return 'Low'
+    elif val <= 13.4:
+        return 'High'
+    else:
+        return 'Very High'
+
+
+def simplify_sem2_grade(val):
+    if val <= 10.75:
+        return 'Very Low'
+    elif val <= 12.2:
+        return 'Low'
+    elif val <= 13.33:
+        return 'High'
+    else:
+        return 'Very High'
+
+
+def simplify_prev_qual_grade(val):
+    if val <= 125:
+        return 'Very Low'
+    elif val <= 133.1:
+        return 'Low'
+    elif val <= 140:
+        return 'High'
+    else:
+        return 'Very High'
+
+
+def simplify_age(age):
+    if age < 18:
+        return '<18'
+    elif age <= 21:
+        return '18-21'
+    elif age <= 25:
+        return '22-25'
+    else:
+        return '>25'
+
+
+def occupation_group(code):
+    if code in OFFICER_OCCUPATIONS:
+        return 'Officer'
+    elif code in LABOR_OCCUPATIONS:
+        return 'Labor'
+    return 'Other'
+
+
+def simplify_course(code):
+    if code in (33, 9119, 9130):
+        return 'Engineering/Tech'
+    elif code in (171, 9070, 9773):
+        return 'Arts/Design'
+    elif code in (9500, 9556, 9085):
+        return 'Health'
+    elif code in (8014, 9238, 9853):
+        return 'Social Sciences'
+    elif code in (9147, 9991, 9254):
+        return 'Business'
+    return 'Other'
+
+
+def encode(val, mapping):
+    return mapping.get(val, 0)
+
+
+def preprocess_input_raw(raw):
+    return {
+        'Previous_qualification': encode(simplify_edu(raw['Previous_qualification']), edu_map),
+        'Mothers_qualification': encode(simplify_edu(raw['Mothers_qualification']), edu_map),
+        'Fathers_qualification': encode(simplify_edu(raw['Fathers_qualification']), edu_map),
+        'Admission_grade': encode(simplify_admission_grade(raw['Admission_grade']), grade_map),
+        'Curricular_units_1st_sem_grade': encode(simplify_sem1_grade(raw['Curricular_units_1st_sem_grade']), grade_map),
+        'Curricular_units_2nd_sem_grade': encode(simplify_sem2_grade(raw['Curricular_units_2nd_sem_grade']), grade_map),
+        'Previous_qualification_grade': encode(simplify_prev_qual_grade(raw['Previous_qualification_grade']), grade_map),
+        'Age_at_enrollment': encode(simplify_age(raw['Age_at_enrollment']), age_map),
+        'Nacionality': encode(simplify_nacionality(raw['Nacionality']), binary_map),
+        'Fathers_occupation': encode(occupation_group(raw['Fathers_occupation']), binary_map),
+        'Mothers_occupation': encode(occupation_group(raw['Mothers_occupation']), binary_map),
+        'Course': encode(simplify_course(raw['Course']), course_map),
+        'Application_mode': encode(simplify_application_mode(raw['Application_mode']), app_mode_map)
+    }
+
+
+# Versi vektor dari preprocess_input_raw untuk satu kohort penuh.
+# Kode kategori dipetakan lewat array lookup (kode -> nilai encode) dan
+# nilai kontinu lewat batas bin, sehingga tidak ada loop Python per baris.
+
+EDU_GROUPS = {
+    0: [19, 37, 38, 35, 36],
+    1: [1, 9, 10, 12, 14, 15, 22, 26, 27, 29, 30],
+    2: [2, 3, 4, 5, 6, 40, 41, 42, 43, 44],
+}
+EDU_DEFAULT = 3
+
+OCCUPATION_GROUPS = {
+    0: [1, 2, 3, 4, 112, 114, 121, 122, 123, 124, 131, 132, 134, 135, 141, 143, 144],
+    1: [5, 6, 7, 8, 9, 10, 151, 152, 153, 154, 161, 163, 171, 172, 174, 175, 181, 182, 183, 191, 192, 193, 194, 195],
+}
+OCCUPATION_DEFAULT = 2
+
+COURSE_GROUPS = {
+    0: [33, 9119, 9130],
+    1: [171, 9070, 9773],
+    2: [9500, 9556, 9085],
+    3: [8014, 9238, 9853],
+    4: [9147, 9991, 9254],
+}
+COURSE_DEFAULT = 5
+
+APP_MODE_GROUPS = {
+    0: [1, 17, 18],
+    1: [2, 5, 10, 16],
+    2: [15, 57],
+    3: [42, 43, 51, 53],
+    4: [26, 27, 39, 44],
+}
+APP_MODE_DEFAULT = 5
+
+NACIONALITY_GROUPS = {0: [1]}
+NACIONALITY_DEFAULT = 1
+
+# Batas atas (inklusif) tiap bin: Very Low, Low, High, sisanya Very High
+ADMISSION_GRADE_EDGES = np.array([117.9, 126.1, 134.8])
+SEM1_GRADE_EDGES = np.array([11.0, 12.29, 13.4])
+SEM2_GRADE_EDGES = np.array([10.75, 12.2, 13.33])
+PREV_QUAL_GRADE_EDGES = np.array([125, 133.1, 140], dtype=float)
+# age < 18 sama dengan age <= nextafter(18, -inf)
+AGE_EDGES = np.array([np.nextafter(18.0, -np.inf), 21, 25])
+
+
+def build_lookup(groups, default):
+    # Satu slot ekstra di ujung tabel tidak pernah diisi grup, jadi table[-1]
+    # selalu berisi nilai default
+    size = max(code for codes in groups.values() for code in codes) + 2
+    table = np.full(size, default, dtype=np.int8)
+    for value, codes in groups.items():
+        table[codes] = value
+    return table
+
+
+EDU_LOOKUP = build_lookup(EDU_GROUPS, EDU_DEFAULT)
+OCCUPATION_LOOKUP = build_lookup(OCCUPATION_GROUPS, OCCUPATION_DEFAULT)
+COURSE_LOOKUP = build_lookup(COURSE_GROUPS, COURSE_DEFAULT)
+APP_MODE_LOOKUP = build_lookup(APP_MODE_GROUPS, APP_MODE_DEFAULT)
+NACIONALITY_LOOKUP = build_lookup(NACIONALITY_GROUPS, NACIONALITY_DEFAULT)
+
+
+def parse_numeric(values, column):
+    # Nilai kosong tetap NaN, tetapi teks yang terisi dan tidak bisa dibaca
+    # sebagai angka (mis. '112,5' atau 'abc') ditolak, bukan diam-diam
+    # menjadi NaN lalu masuk bin terakhir atau kode default
+    if pd.api.types.is_numeric_dtype(values):
+        return values.to_numpy(dtype=float, na_value=np.nan)
+    numeric = pd.to_numeric(values, errors="coerce")
+    invalid = numeric.isna() & values.notna()
+    if invalid.any():
+        raise ValueError(f"Kolom {column}: {int(invalid.sum())} nilai bukan angka (contoh: {values[invalid].iloc[0]!r})")
+    return numeric.to_numpy(dtype=float, na_value=np.nan)
+
+
+def encode_codes(values, table):
+    values = np.asarray(values, dtype=float)
+    # Kode yang bukan bilangan bulat dalam jangkauan tabel jatuh ke default
+    valid = np.isfinite(values) & (values >= 0) & (values < len(table)) & (values == np.floor(values))
+    out = np.full(len(values), table[-1], dtype=np.int8)
+    out[valid] = table[values[valid].astype(np.int64)]
+    return out
+
+
+def encode_bins(values, edges):
+    values = np.asarray(values, dtype=float)
+    # Jumlah batas yang lebih kecil dari nilai = indeks bin; NaN jatuh ke bin terakhir
+    return np.searchsorted(edges, values, side="left").astype(np.int8)
+
+
+ENCODED_COLUMNS = [
+    ('Previous_qualification', encode_codes, EDU_LOOKUP),
+    ('Mothers_qualification', encode_codes, EDU_LOOKUP),
+    ('Fathers_qualification', encode_codes, EDU_LOOKUP),
+    ('Admission_grade', encode_bins, ADMISSION_GRADE_EDGES),
+    ('Curricular_units_1st_sem_grade', encode_bins, SEM1_GRADE_EDGES),
+    ('Curricular_units_2nd_sem_grade', encode_bins, SEM2_GRADE_EDGES),
+    ('Previous_qualification_grade', encode_bins, PREV_QUAL_GRADE_EDGES),
+    ('Age_at_enrollment', encode_bins, AGE_EDGES),
+    ('Nacionality', encode_codes, NACIONALITY_LOOKUP),
+    ('Fathers_occupation', encode_codes, OCCUPATION_LOOKUP),
+    ('Mothers_occupation', encode_codes, OCCUPATION_LOOKUP),
+    ('Course', encode_codes, COURSE_LOOKUP),
+    ('Application_mode', encode_codes, APP_MODE_LOOKUP),
+]
+
+
+def preprocess_input_frame(raw_df):
+    return pd.DataFrame(
+        {column: encoder(parse_numeric(raw_df[column], column), table) for column, encoder, table in ENCODED_COLUMNS},
+        index=raw_df.index,
+    )
+
+
+# Kolom mentah yang diteruskan apa adanya ke model (lihat features.update di app.py)
+PASSTHROUGH_COLUMNS = [
+    'Marital_status',
+    'Application_order',
+    'Daytime_evening_attendance',
+    'Displaced',
+    'Educational_special_needs',
+    'Debtor',
+    'Tuition_fees_up_to_date',
+    'Gender',
+    'Scholarship_holder',
+    'International',
+    'Curricular_units_1st_sem_credited',
+    'Curricular_units_1st_sem_enrolled',
+    'Curricular_units_1st_sem_evaluations',
+    'Curricular_units_1st_sem_approved',
+    'Curricular_units_1st_sem_without_evaluations',
+    'Curricular_units_2nd_sem_credited',
+    'Curricular_units_2nd_sem_enrolled',
+    'Curricular_units_2nd_sem_evaluations',
+    'Curricular_units_2nd_sem_approved',
+    'Curricular_units_2nd_sem_without_evaluations',
+    'Unemployment_rate',
+    'Inflation_rate',
+    'GDP',
+]
+
+RAW_COLUMNS = [column for column, _, _ in ENCODED_COLUMNS] + PASSTHROUGH_COLUMNS
+
+# Skema tipe data untuk kolom input model. Kode hasil encode bernilai 0-5
+# dan jumlah SKS di bawah 50, jadi cukup int8; indikator makro float32
+# (sklearn juga menghitung dalam float32). Satu baris kohort menjadi 45
+# byte, bukan 288 byte int64/float64.
+FEATURE_DTYPES = {column: np.int8 for column, _, _ in ENCODED_COLUMNS}
+FEATURE_DTYPES.update({column: np.int8 for column in PASSTHROUGH_COLUMNS})
+FEATURE_DTYPES.update({
+    'Unemployment_rate': np.float32,
+    'Inflation_rate': np.float32,
+    'GDP': np.float32,
+})
+
+
+# Kolom mentah bernilai pecahan. File CSV dibaca dengan dtype tetap untuk
+# kolom ini supaya tipe kolom tidak berubah dari int64 ke float64 antar shard
+FLOAT_COLUMNS = [
+    'Previous_qualification_grade',
+    'Admission_grade',
+    'Curricular_units_1st_sem_grade',
+    'Curricular_units_2nd_sem_grade',
+    'Unemployment_rate',
+    'Inflation_rate',
+    'GDP',
+]
+
+
+def missing_raw_columns(raw_df):
+    return [column for column in RAW_COLUMNS if column not in raw_df.columns]
+
+
+def pack_column(values, column):
+    dtype = FEATURE_DTYPES[column]
+    numeric = parse_numeric(values, column)
+    if not np.issubdtype(dtype, np.integer):
+        return np.asarray(numeric, dtype=dtype)
+
+    # Nilai harus bilangan bulat yang muat di dtype sempit tanpa terpotong
+    info = np.iinfo(dtype)
+    invalid = ~np.isfinite(numeric) | (numeric != np.floor(numeric)) | (numeric < info.min) | (numeric > info.max)
+    if invalid.any():
+        raise ValueError(f"Kolom {column}: {int(invalid.sum())} nilai bukan bilangan bulat antara {info.min} dan {info.max}")
+    return numeric.astype(dtype)
+
+
+def build_feature_frame(raw_df, feature_names):
+    # Matriks input model langsung dalam dtype sempit sesuai FEATURE_DTYPES
+    features = preprocess_input_frame(raw_df)
+    for column in PASSTHROUGH_COLUMNS:
+        features[column] = pack_column(raw_df[column], column)
+    return features[feature_names]
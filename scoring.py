@@ -0,0 +1,96 @@
+import pickle
+import weakref
+
+import numpy as np
+import pandas as pd
+
+from forest_engine import CompiledForest, compile_forest, feature_vector
+from model_artifact import is_artifact, load_artifact
+from preprocessing import PASSTHROUGH_COLUMNS, preprocess_input_raw
+
+MODEL_PATH = "rf_model.pkl"
+
+STATUS_LABELS = {0: 'Lulus', 1: 'Dropout'}
+DROPOUT_CLASS = 1
+
+ENGINES = ('sklearn', 'numpy')
+
+
+def load_model(path=MODEL_PATH, engine='sklearn'):
+    if engine not in ENGINES:
+        raise ValueError(f"Engine tidak dikenal: {engine}")
+    # Artefak direktori (lihat model_artifact.py) selalu memakai engine numpy
+    if is_artifact(path):
+        return load_artifact(path)
+    with open(path, "rb") as f:
+        model, feature_names = pickle.load(f)
+    if engine == 'numpy':
+        model = compile_forest(model)
+    return model, feature_names
+
+
+def assemble_features(raw):
+    features = preprocess_input_raw(raw)
+    features.update({column: raw[column] for column in PASSTHROUGH_COLUMNS})
+    return features
+
+
+def model_input(model, feature_names, features):
+    # Engine numpy menerima vektor fitur langsung tanpa membangun DataFrame
+    if isinstance(model, CompiledForest):
+        return feature_vector(features, feature_names)
+    return pd.DataFrame([features])[feature_names]
+
+
+def dropout_class_index(model):
+    return list(model.classes_).index(DROPOUT_CLASS)
+
+
+def predict_with_proba(model, X):
+    # Sama dengan model.predict (argmax predict_proba) tetapi sekaligus
+    # mengembalikan probabilitas dropout tanpa menelusuri forest dua kali
+    proba = model.predict_proba(X)
+    predictions = model.classes_.take(np.argmax(proba, axis=1), axis=0)
+    return predictions, proba[:, dropout_class_index(model)]
+
+
+_compiled = weakref.WeakKeyDictionary()
+
+
+def as_compiled(model):
+    # Kontribusi fitur dihitung dari forest yang sudah diratakan; hasil
+    # kompilasi model sklearn disimpan selama model itu masih hidup
+    if isinstance(model, CompiledForest):
+        return model
+    if model not in _compiled:
+        _compiled[model] = compile_forest(model)
+    return _compiled[model]
+
+
+def explain(model, X):
+    forest = as_compiled(model)
+    return forest.contributions(X, dropout_class_index(forest))
+
+
+def label_predictions(raw_df, predictions, probabilities=None, contributions=None):
+    result = raw_df.copy()
+    result['Prediction'] = predictions
+    result['Status'] = np.where(result['Prediction'] == 1, STATUS_LABELS[1], STATUS_LABELS[0])
+    if probabilities is not None:
+        result['Dropout_probability'] = probabilities
+    if contributions is not None:
+        result = pd.concat([result, contributions.add_prefix('contrib_')], axis=1)
+    return result
+
+
+def score_features(model, feature_names, raw_df, X, explain_features=False):
+    # X adalah matriks fitur build_feature_frame(raw_df, feature_names)
+    if len(X) == 0:
+        return label_predictions(raw_df, np.array([], dtype=int), np.array([], dtype=float))
+    predictions, probabilities = predict_with_proba(model, X)
+    contributions = None
+    if explain_features:
+        bias, values = explain(model, X)
+        contributions = pd.DataFrame(values, columns=feature_names, index=raw_df.index)
+        contributions.insert(0, 'bias', bias)
+    return label_predictions(raw_df, predictions, probabilities, contributions)
@@ -0,0 +1,203 @@
+import argparse
+import json
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+
+from preprocessing import RAW_COLUMNS, build_feature_frame
+from scoring import ENGINES, MODEL_PATH, STATUS_LABELS, load_model, predict_with_proba
+
+DEFAULT_MAX_BATCH_SIZE = 64
+DEFAULT_MAX_WAIT_MS = 5.0
+
+
+class MicroBatcher:
+    # Mengumpulkan request yang datang bersamaan selama max_wait detik (atau
+    # sampai max_batch_size baris) lalu memprediksinya dengan satu panggilan
+    # model.predict
+
+    def __init__(self, model, feature_names, max_batch_size=DEFAULT_MAX_BATCH_SIZE, max_wait=DEFAULT_MAX_WAIT_MS / 1000):
+        self.model = model
+        self.feature_names = feature_names
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.batches = 0
+        self.rows = 0
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, records):
+        future = Future()
+        self._queue.put((records, future))
+        return future
+
+    def predict(self, records, timeout=None):
+        return self.submit(records).result(timeout)
+
+    def close(self):
+        self._queue.put(None)
+        self._thread.join()
+
+    def _collect(self, first):
+        batch = [first]
+        rows = len(first[0])
+        deadline = time.monotonic() + self.max_wait
+        while rows < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is None:
+                self._queue.put(None)
+                break
+            batch.append(item)
+            rows += len(item[0])
+        return batch
+
+    def _encode(self, records):
+        return build_feature_frame(pd.DataFrame(records, columns=RAW_COLUMNS), self.feature_names)
+
+    def _encode_each(self, batch):
+        # Jalur lambat saat batch berisi nilai tidak valid: encode per request
+        # agar hanya request pengirimnya yang gagal
+        valid, frames = [], []
+        for request_records, future in batch:
+            try:
+                frames.append(self._encode(request_records))
+            except ValueError as e:
+                future.set_exception(e)
+                continue
+            valid.append((request_records, future))
+        return valid, pd.concat(frames) if frames else None
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch = self._collect(first)
+            try:
+                X = self._encode([record for request_records, _ in batch for record in request_records])
+            except ValueError:
+                batch, X = self._encode_each(batch)
+                if not batch:
+                    continue
+            try:
+                predictions, probabilities = predict_with_proba(self.model, X)
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+
+            self.batches += 1
+            self.rows += len(X)
+            start = 0
+            for request_records, future in batch:
+                end = start + len(request_records)
+                future.set_result([(int(p), float(q)) for p, q in zip(predictions[start:end], probabilities[start:end])])
+                start = end
+
+
+def format_prediction(prediction, probability):
+    return {'prediction': prediction, 'status': STATUS_LABELS[prediction], 'dropout_probability': probability}
+
+
+class PredictionHandler(BaseHTTPRequestHandler):
+    batcher = None
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send_json(200, {'status': 'ok', 'batches': self.batcher.batches, 'rows': self.batcher.rows})
+        else:
+            self._send_json(404, {'error': 'not found'})
+
+    def do_POST(self):
+        if self.path != "/predict":
+            self._send_json(404, {'error': 'not found'})
+            return
+
+        try:
+            payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+        except ValueError:
+            self._send_json(400, {'error': 'body harus berupa JSON'})
+            return
+
+        # Body boleh satu objek mahasiswa atau list objek mahasiswa
+        single = isinstance(payload, dict)
+        records = [payload] if single else payload
+        if not isinstance(records, list) or not all(isinstance(r, dict) for r in records):
+            self._send_json(400, {'error': 'body harus berupa objek atau list objek'})
+            return
+        for record in records:
+            missing = [column for column in RAW_COLUMNS if column not in record]
+            if missing:
+                self._send_json(400, {'error': f"Kolom tidak ditemukan: {', '.join(missing)}"})
+                return
+
+        try:
+            predictions = self.batcher.predict(records) if records else []
+        except ValueError as e:
+            self._send_json(400, {'error': str(e)})
+            return
+        except Exception as e:
+            self._send_json(500, {'error': str(e)})
+            return
+
+        results = [format_prediction(p, q) for p, q in predictions]
+        self._send_json(200, results[0] if single else results)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class PredictionServer(ThreadingHTTPServer):
+    # Backlog bawaan (5) membuat koneksi tertolak saat lonjakan request
+    request_queue_size = 128
+
+
+def make_server(batcher, host="127.0.0.1", port=8000):
+    handler = type("BoundPredictionHandler", (PredictionHandler,), {'batcher': batcher})
+    return PredictionServer((host, port), handler)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Server HTTP/JSON untuk prediksi dropout dengan micro-batching.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--model", default=MODEL_PATH, help="Path artefak model (default: %(default)s)")
+    parser.add_argument("--max-batch-size", type=int, default=DEFAULT_MAX_BATCH_SIZE, help="Maksimum baris per panggilan predict (default: %(default)s)")
+    parser.add_argument("--max-wait-ms", type=float, default=DEFAULT_MAX_WAIT_MS, help="Jendela pengumpulan batch dalam milidetik (default: %(default)s)")
+    parser.add_argument("--engine", choices=ENGINES, default='sklearn', help="Engine inferensi (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    model, feature_names = load_model(args.model, args.engine)
+    batcher = MicroBatcher(model, feature_names, args.max_batch_size, args.max_wait_ms / 1000)
+    server = make_server(batcher, args.host, args.port)
+    print(f"Melayani prediksi di http://{args.host}:{args.port}/predict")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        batcher.close()
+
+
+if __name__ == "__main__":
+    main()
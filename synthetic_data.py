@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+
+from form_options import (
+    app_mode_dict, course_dict, marital_dict, nacionality_dict, parent_occupation_dict,
+    parent_qualification_dict, previous_qualification_dict,
+)
+from preprocessing import RAW_COLUMNS
+
+# Pilihan kode sama dengan selectbox di form
+CATEGORICAL_OPTIONS = {
+    'Marital_status': marital_dict,
+    'Application_mode': app_mode_dict,
+    'Course': course_dict,
+    'Previous_qualification': previous_qualification_dict,
+    'Nacionality': nacionality_dict,
+    'Mothers_qualification': parent_qualification_dict,
+    'Fathers_qualification': parent_qualification_dict,
+    'Mothers_occupation': parent_occupation_dict,
+    'Fathers_occupation': parent_occupation_dict,
+}
+
+# Batas (min, max) sama dengan number_input di form
+INTEGER_RANGES = {
+    'Application_order': (0, 9),
+    'Age_at_enrollment': (15, 60),
+    'Curricular_units_1st_sem_credited': (0, 20),
+    'Curricular_units_1st_sem_enrolled': (0, 26),
+    'Curricular_units_1st_sem_evaluations': (0, 45),
+    'Curricular_units_1st_sem_approved': (0, 26),
+    'Curricular_units_1st_sem_without_evaluations': (0, 12),
+    'Curricular_units_2nd_sem_credited': (0, 19),
+    'Curricular_units_2nd_sem_enrolled': (0, 23),
+    'Curricular_units_2nd_sem_evaluations': (0, 33),
+    'Curricular_units_2nd_sem_approved': (0, 20),
+    'Curricular_units_2nd_sem_without_evaluations': (0, 12),
+}
+
+FLOAT_RANGES = {
+    'Previous_qualification_grade': (0.0, 200.0),
+    'Admission_grade': (0.0, 200.0),
+    'Curricular_units_1st_sem_grade': (0.0, 20.0),
+    'Curricular_units_2nd_sem_grade': (0.0, 20.0),
+    'Unemployment_rate': (7.6, 16.2),
+    'Inflation_rate': (-0.8, 3.7),
+    'GDP': (-4.06, 3.51),
+}
+
+BINARY_COLUMNS = [
+    'Daytime_evening_attendance',
+    'Debtor',
+    'Scholarship_holder',
+    'Displaced',
+    'Gender',
+    'Tuition_fees_up_to_date',
+    'Educational_special_needs',
+    'International',
+]
+
+
+def generate_students(n, seed=0):
+    rng = np.random.default_rng(seed)
+    data = {}
+    for column, options in CATEGORICAL_OPTIONS.items():
+        data[column] = rng.choice(list(options.keys()), size=n)
+    for column, (low, high) in INTEGER_RANGES.items():
+        data[column] = rng.integers(low, high + 1, size=n)
+    for column, (low, high) in FLOAT_RANGES.items():
+        data[column] = np.round(rng.uniform(low, high, size=n), 2)
+    for column in BINARY_COLUMNS:
+        data[column] = rng.integers(0, 2, size=n)
+    return pd.DataFrame(data)[RAW_COLUMNS]
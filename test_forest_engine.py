@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+
+from forest_engine import compile_forest
+from model_artifact import load_artifact, save_artifact
+from preprocessing import RAW_COLUMNS, build_feature_frame
+from synthetic_data import generate_students
+
+
+@pytest.fixture(scope="module")
+def fitted():
+    students = generate_students(2000, seed=11)
+    X = build_feature_frame(students, RAW_COLUMNS).astype(np.float64)
+    rng = np.random.default_rng(11)
+    y = ((students['Tuition_fees_up_to_date'] == 0) | (rng.random(len(students)) < 0.15)).astype(int)
+    # Sebagian nilai kosong supaya pohon belajar arah missing_go_to_left
+    for column in ('Admission_grade', 'Unemployment_rate', 'Curricular_units_2nd_sem_approved'):
+        X.loc[rng.random(len(X)) < 0.1, column] = np.nan
+    model = RandomForestClassifier(n_estimators=25, max_depth=8, random_state=0).fit(X, y)
+
+    test = build_feature_frame(generate_students(500, seed=12), RAW_COLUMNS).astype(np.float64)
+    test.iloc[:50, [0, 3, 20]] = np.nan
+    test.iloc[50:60] = np.nan
+    return model, test
+
+
+def assert_matches_sklearn(forest, model, X):
+    np.testing.assert_array_equal(forest.predict_proba(X), model.predict_proba(X))
+    np.testing.assert_array_equal(forest.predict(X), model.predict(X))
+
+
+def test_compiled_forest_matches_sklearn(fitted):
+    model, X = fitted
+    assert_matches_sklearn(compile_forest(model), model, X)
+
+
+def test_artifact_round_trip(fitted, tmp_path):
+    model, X = fitted
+    save_artifact(compile_forest(model), list(X.columns), tmp_path / "model")
+    forest, feature_names = load_artifact(tmp_path / "model")
+    assert feature_names == list(X.columns)
+    assert_matches_sklearn(forest, model, X)
+
+
+def test_contributions_sum_to_probability(fitted):
+    model, X = fitted
+    forest = compile_forest(model)
+    bias, values = forest.contributions(X, 1)
+    np.testing.assert_allclose(bias + values.sum(axis=1), model.predict_proba(X)[:, 1], rtol=0, atol=1e-12)
@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from preprocessing import (
+    ADMISSION_GRADE_EDGES, AGE_EDGES, ENCODED_COLUMNS, PREV_QUAL_GRADE_EDGES, RAW_COLUMNS, SEM1_GRADE_EDGES,
+    SEM2_GRADE_EDGES, build_feature_frame, preprocess_input_frame, preprocess_input_raw,
+)
+from synthetic_data import generate_students
+
+ENCODED = [column for column, _, _ in ENCODED_COLUMNS]
+CODE_COLUMNS = [column for column, encoder, _ in ENCODED_COLUMNS if encoder.__name__ == 'encode_codes']
+BIN_EDGES = {
+    'Admission_grade': ADMISSION_GRADE_EDGES,
+    'Curricular_units_1st_sem_grade': SEM1_GRADE_EDGES,
+    'Curricular_units_2nd_sem_grade': SEM2_GRADE_EDGES,
+    'Previous_qualification_grade': PREV_QUAL_GRADE_EDGES,
+    'Age_at_enrollment': AGE_EDGES,
+}
+
+
+def assert_parity(raw_df):
+    expected = pd.DataFrame([preprocess_input_raw(row) for row in raw_df.to_dict('records')], index=raw_df.index)
+    actual = preprocess_input_frame(raw_df)
+    pd.testing.assert_frame_equal(actual[ENCODED].astype(np.int64), expected[ENCODED].astype(np.int64))
+
+
+def test_parity_on_synthetic_cohort():
+    assert_parity(generate_students(5000, seed=1))
+
+
+@pytest.mark.parametrize('column', list(BIN_EDGES))
+def test_parity_on_bin_edges(column):
+    edges = BIN_EDGES[column]
+    values = np.concatenate([edges, np.nextafter(edges, -np.inf), np.nextafter(edges, np.inf), [18.0, 0.0, 1e6]])
+    raw_df = generate_students(len(values), seed=2)
+    raw_df[column] = values
+    assert_parity(raw_df)
+
+
+@pytest.mark.parametrize('column', CODE_COLUMNS)
+def test_parity_on_unknown_codes(column):
+    values = [-1, 0, 1.5, 10.0, 200, 9991, 9992, 10 ** 6, np.nan]
+    raw_df = generate_students(len(values), seed=3)
+    raw_df[column] = values
+    assert_parity(raw_df)
+
+
+def test_nan_grades_fall_into_last_bin():
+    raw_df = generate_students(3, seed=4)
+    raw_df['Admission_grade'] = np.nan
+    raw_df['Age_at_enrollment'] = np.nan
+    assert_parity(raw_df)
+    assert (preprocess_input_frame(raw_df)['Admission_grade'] == 3).all()
+
+
+@pytest.mark.parametrize('column, value', [
+    ('Admission_grade', '112,5'),
+    ('Age_at_enrollment', 'abc'),
+    ('Course', 'Informatika'),
+    ('Unemployment_rate', '10,8'),
+    ('Displaced', 'abc'),
+])
+def test_unparseable_values_are_rejected(column, value):
+    raw_df = generate_students(5, seed=5).astype(object)
+    raw_df.loc[2, column] = value
+    with pytest.raises(ValueError, match=column):
+        build_feature_frame(raw_df, RAW_COLUMNS)
+
+
+def test_numeric_text_and_missing_values_are_accepted():
+    raw_df = generate_students(5, seed=6).astype(object)
+    raw_df.loc[0, 'Admission_grade'] = '112.5'
+    raw_df.loc[1, 'Admission_grade'] = None
+    features = build_feature_frame(raw_df, RAW_COLUMNS)
+    assert features['Admission_grade'].tolist()[:2] == [0, 3]
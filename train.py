@@ -0,0 +1,159 @@
+import argparse
+import copy
+import pickle
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.metrics import accuracy_score, f1_score, recall_score
+from sklearn.model_selection import train_test_split
+
+from drift import reference_profile
+from forest_engine import compile_forest
+from preprocessing import RAW_COLUMNS, build_feature_frame, missing_raw_columns
+from scoring import DROPOUT_CLASS, ENGINES, MODEL_PATH
+
+DEFAULT_TARGET = 'Status'
+DEFAULT_TREE_COUNTS = (10, 25, 50, 100, 200)
+DEFAULT_DEPTHS = (None, 20, 15, 12, 10, 8, 6)
+LATENCY_SAMPLES = 300
+
+
+def load_training_data(path, target_column):
+    raw_df = pd.read_csv(path) if not path.lower().endswith(".parquet") else pd.read_parquet(path)
+    missing = missing_raw_columns(raw_df)
+    if target_column not in raw_df.columns:
+        missing.append(target_column)
+    if missing:
+        raise ValueError(f"Kolom tidak ditemukan: {', '.join(missing)}")
+
+    # Target teks (Dropout/Graduate/Enrolled) dijadikan biner: 1 = Dropout
+    target = raw_df[target_column]
+    if pd.api.types.is_numeric_dtype(target):
+        y = (target == DROPOUT_CLASS).astype(int).to_numpy()
+    else:
+        y = (target == 'Dropout').astype(int).to_numpy()
+    return build_feature_frame(raw_df, RAW_COLUMNS), y
+
+
+def take_trees(forest, n_trees):
+    pruned = copy.copy(forest)
+    pruned.estimators_ = forest.estimators_[:n_trees]
+    pruned.n_estimators = n_trees
+    return pruned
+
+
+def single_row_p99_ms(model, X, engine):
+    # Mengukur jalur satu baris seperti di form: DataFrame satu baris untuk
+    # sklearn, vektor numpy untuk engine numpy
+    if engine == 'numpy':
+        model = compile_forest(model)
+        rows = [X.iloc[i].to_numpy(dtype=np.float32) for i in range(min(LATENCY_SAMPLES, len(X)))]
+    else:
+        rows = [X.iloc[[i]] for i in range(min(LATENCY_SAMPLES, len(X)))]
+    model.predict(rows[0])
+    timings = []
+    for row in rows:
+        start = time.perf_counter()
+        model.predict(row)
+        timings.append(time.perf_counter() - start)
+    return float(np.percentile(timings, 99) * 1e3)
+
+
+def evaluate(model, feature_names, X_val, y_val, engine):
+    predicted = model.predict(X_val)
+    return {
+        'n_trees': len(model.estimators_),
+        'max_depth': max(tree.tree_.max_depth for tree in model.estimators_),
+        'n_nodes': int(sum(tree.tree_.node_count for tree in model.estimators_)),
+        'accuracy': accuracy_score(y_val, predicted),
+        'dropout_recall': recall_score(y_val, predicted, pos_label=DROPOUT_CLASS),
+        'dropout_f1': f1_score(y_val, predicted, pos_label=DROPOUT_CLASS),
+        'p99_ms': single_row_p99_ms(model, X_val, engine),
+        'size_kb': len(pickle.dumps((model, feature_names))) / 1024,
+    }
+
+
+def trade_off_curve(X_train, y_train, X_val, y_val, tree_counts, depths, n_jobs, seed, engine):
+    feature_names = list(X_train.columns)
+    max_trees = max(tree_counts)
+    rows = []
+    models = []
+    for depth in depths:
+        forest = RandomForestClassifier(n_estimators=max_trees, max_depth=depth, n_jobs=n_jobs, random_state=seed)
+        forest.fit(X_train, y_train)
+        # Pohon hasil bagging saling independen, jadi k pohon pertama adalah
+        # forest kecil yang sah tanpa perlu training ulang
+        for n_trees in sorted(tree_counts):
+            model = take_trees(forest, n_trees)
+            model.n_jobs = None
+            row = evaluate(model, feature_names, X_val, y_val, engine)
+            row['depth_limit'] = depth
+            rows.append(row)
+            models.append(model)
+    return pd.DataFrame(rows), models
+
+
+def select_model(curve, target_p99_ms, target_size_kb, recall_tolerance):
+    best_recall = curve['dropout_recall'].max()
+    eligible = curve[curve['dropout_recall'] >= best_recall - recall_tolerance]
+    if target_p99_ms is not None:
+        eligible = eligible[eligible['p99_ms'] <= target_p99_ms]
+    if target_size_kb is not None:
+        eligible = eligible[eligible['size_kb'] <= target_size_kb]
+    if eligible.empty:
+        return None
+    return eligible.sort_values(['size_kb', 'p99_ms']).index[0]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Latih dan kompres random forest sesuai anggaran latensi dan ukuran artefak.")
+    parser.add_argument("input", help="Data latih CSV/Parquet dengan kolom mentah dan kolom target")
+    parser.add_argument("--target-column", default=DEFAULT_TARGET, help="Kolom target; nilai 'Dropout' atau 1 dianggap dropout (default: %(default)s)")
+    parser.add_argument("--output", default=MODEL_PATH, help="Path artefak (model, feature_names) (default: %(default)s)")
+    parser.add_argument("--report", help="Simpan kurva trade-off sebagai CSV")
+    parser.add_argument("--trees", type=int, nargs="+", default=list(DEFAULT_TREE_COUNTS), help="Jumlah pohon yang dicoba")
+    parser.add_argument("--depths", type=int, nargs="+", help="Batas kedalaman yang dicoba; 0 berarti tanpa batas")
+    parser.add_argument("--target-p99-ms", type=float, help="Batas p99 latensi prediksi satu baris (ms)")
+    parser.add_argument("--target-size-kb", type=float, help="Batas ukuran artefak (KB)")
+    parser.add_argument("--recall-tolerance", type=float, default=0.01, help="Penurunan recall Dropout yang masih diterima (default: %(default)s)")
+    parser.add_argument("--engine", choices=ENGINES, default='sklearn', help="Engine untuk mengukur latensi (default: %(default)s)")
+    parser.add_argument("--n-jobs", type=int, default=-1, help="Jumlah proses training paralel (default: semua core)")
+    parser.add_argument("--validation-size", type=float, default=0.2)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--drift-reference", help="Simpan profil referensi drift dari data latih (lihat drift.py)")
+    args = parser.parse_args(argv)
+
+    depths = [None if d == 0 else d for d in args.depths] if args.depths else list(DEFAULT_DEPTHS)
+
+    try:
+        X, y = load_training_data(args.input, args.target_column)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 1
+    if args.drift_reference:
+        reference_profile(X).save(args.drift_reference)
+    X_train, X_val, y_train, y_val = train_test_split(X, y, test_size=args.validation_size, stratify=y, random_state=args.seed)
+
+    curve, models = trade_off_curve(X_train, y_train, X_val, y_val, args.trees, depths, args.n_jobs, args.seed, args.engine)
+    with pd.option_context('display.width', 200, 'display.max_rows', None):
+        print(curve.round(4).to_string())
+    if args.report:
+        curve.to_csv(args.report, index=False)
+
+    selected = select_model(curve, args.target_p99_ms, args.target_size_kb, args.recall_tolerance)
+    if selected is None:
+        print("Tidak ada model yang memenuhi anggaran latensi/ukuran dengan recall Dropout yang dipertahankan", file=sys.stderr)
+        return 1
+
+    with open(args.output, "wb") as f:
+        pickle.dump((models[selected], list(X.columns)), f)
+    print(f"Model terpilih:\n{curve.loc[selected].to_string()}")
+    print(f"Model disimpan -> {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
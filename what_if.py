@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+
+from preprocessing import build_feature_frame
+from scoring import predict_with_proba
+from synthetic_data import INTEGER_RANGES
+
+
+def integer_values(column):
+    low, high = INTEGER_RANGES[column]
+    return list(range(low, high + 1))
+
+
+def grade_values(low, high, step):
+    return [float(v) for v in np.round(np.arange(low, high + step / 2, step), 2)]
+
+
+# Field yang bisa divariasikan beserta nilai yang dicoba
+WHAT_IF_FIELDS = {
+    'Curricular_units_2nd_sem_approved': integer_values('Curricular_units_2nd_sem_approved'),
+    'Curricular_units_1st_sem_approved': integer_values('Curricular_units_1st_sem_approved'),
+    'Curricular_units_2nd_sem_enrolled': integer_values('Curricular_units_2nd_sem_enrolled'),
+    'Curricular_units_2nd_sem_grade': grade_values(0.0, 20.0, 0.5),
+    'Curricular_units_1st_sem_grade': grade_values(0.0, 20.0, 0.5),
+    'Admission_grade': grade_values(95.0, 190.0, 5.0),
+    'Tuition_fees_up_to_date': [0, 1],
+    'Scholarship_holder': [0, 1],
+    'Debtor': [0, 1],
+}
+
+
+def variation_grid(raw, fields):
+    # Produk kartesius nilai field terpilih; kolom lain tetap sama dengan raw
+    columns = list(fields)
+    mesh = np.meshgrid(*(np.asarray(fields[c]) for c in columns), indexing='ij')
+    size = mesh[0].size if mesh else 1
+    grid = pd.DataFrame({column: np.repeat(value, size) for column, value in raw.items()})
+    for column, values in zip(columns, mesh):
+        grid[column] = values.ravel()
+    return grid
+
+
+def sweep(model, feature_names, raw, fields):
+    grid = variation_grid(raw, fields)
+    predictions, probabilities = predict_with_proba(model, build_feature_frame(grid, feature_names))
+    result = grid[list(fields)].copy()
+    result['Prediction'] = predictions
+    result['Dropout_probability'] = probabilities
+    return result